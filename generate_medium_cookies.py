@@ -1,11 +1,14 @@
 import asyncio
 import os
 import json
-from playwright.async_api import async_playwright
-import time
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
 # Get environment variables
 MEDIUM_COOKIES_FILE = os.getenv("MEDIUM_COOKIES_FILE", "medium_cookies.json")
+# Optional Chromium profile directory shared with the web scraping server; logging in here stores the
+# session in that profile as well as in the cookie file
+MEDIUM_PROFILE_DIR = os.getenv("MEDIUM_PROFILE_DIR")
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
 
 async def main():
     """
@@ -23,10 +26,18 @@ async def main():
     
     async with async_playwright() as p:
         # Launch browser in non-headless mode so you can interact with it
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
-        )
+        if MEDIUM_PROFILE_DIR:
+            # The profile can only be opened by one browser at a time, so stop the scraping server first
+            print(f"Using the browser profile in: {MEDIUM_PROFILE_DIR}")
+            browser = None
+            context = await p.chromium.launch_persistent_context(
+                MEDIUM_PROFILE_DIR,
+                headless=False,
+                user_agent=USER_AGENT
+            )
+        else:
+            browser = await p.chromium.launch(headless=False)
+            context = await browser.new_context(user_agent=USER_AGENT)
         
         # Create a new page
         page = await context.new_page()
@@ -42,31 +53,24 @@ async def main():
         print("3. Verify you're successfully logged in by seeing your avatar in the top right")
         print("\nThis window will wait for 5 minutes while you complete the login.")
         
-        # Check for login every 10 seconds for up to 5 minutes
-        max_wait_time = 5 * 60  # 5 minutes in seconds
-        start_time = time.time()
+        print("Waiting for login... (Press Ctrl+C to cancel)")
         
-        login_detected = False
-        while time.time() - start_time < max_wait_time:
-            # Check for authentication indicators
-            for selector in ['button[aria-label="User"]', 'img.avatar', 'a[href*="/@"]', 'button:has-text("Write")']:
-                try:
-                    if await page.locator(selector).count() > 0 and await page.locator(selector).first.is_visible():
-                        login_detected = True
-                        break
-                except:
-                    pass
-            
-            if login_detected:
-                break
-                
-            # Wait before checking again
-            await asyncio.sleep(10)
-            print("Waiting for login... (Press Ctrl+C to cancel)")
+        # Wait up to 5 minutes for any authentication indicator to become visible, returning as soon as one does
+        max_wait_time = 5 * 60 * 1000  # 5 minutes in milliseconds
+        logged_in_indicator = page.locator(
+            'button[aria-label="User"], img.avatar, a[href*="/@"], button:has-text("Write")'
+        ).filter(visible=True).first
+        
+        try:
+            await logged_in_indicator.wait_for(state="visible", timeout=max_wait_time)
+            login_detected = True
+        except PlaywrightTimeoutError:
+            login_detected = False
             
         if login_detected:
             print("\n✅ Login detected! Saving cookies...")
-            cookies = await context.cookies()
+            # Save the full storage state (cookies plus localStorage) in the format the scraper loads
+            state = await context.storage_state()
             
             # Ensure directory exists
             cookie_dir = os.path.dirname(MEDIUM_COOKIES_FILE)
@@ -75,7 +79,7 @@ async def main():
                 
             # Save cookies to file
             with open(MEDIUM_COOKIES_FILE, "w") as f:
-                json.dump(cookies, f)
+                json.dump(state, f)
                 
             print(f"Cookies saved to: {MEDIUM_COOKIES_FILE}")
             print("These cookies will be used automatically by the web scraper.")
@@ -83,8 +87,11 @@ async def main():
             print("\n❌ Login not detected within the 5-minute timeout.")
             print("Please try again when you have time to complete the login process.")
         
-        # Close the browser
-        await browser.close()
+        # Close the browser (for a persistent profile, closing the context flushes it to disk)
+        if browser is not None:
+            await browser.close()
+        else:
+            await context.close()
         print("\nBrowser closed. You can close this window now.")
 
 if __name__ == "__main__":
@@ -9,10 +9,21 @@ from google.auth.transport.requests import Request
 import pickle
 from bs4 import BeautifulSoup
 import json
+import re
+import functools
 from urllib.parse import urlparse, urlunparse
 
+# orjson is optional: it serializes large article lists several times faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 mcp = FastMCP("Gmail MCP Server")
 
+# Markers identifying a Medium Daily Digest email (matched case-insensitively in a single scan)
+_MEDIUM_SENTINEL = re.compile(r"medium daily digest|today's highlights", re.IGNORECASE)
+
 # Defining Tools
 @mcp.tool()
 def get_gmail_message(message_id: str = None, query: str = None) -> dict:
@@ -256,13 +267,13 @@ def extract_medium_articles(email_body: str) -> str:
     articles = []
     
     try:
+        # Check if this appears to be a Medium Daily Digest before paying for a full parse
+        if not _MEDIUM_SENTINEL.search(email_body):
+            return _json_dumps([])
+        
         # Parse the HTML
         soup = BeautifulSoup(email_body, 'html.parser')
         
-        # Check if this appears to be a Medium Daily Digest (case-insensitive)
-        if "medium daily digest" not in email_body.lower() and "today's highlights" not in email_body.lower():
-            return json.dumps([])
-        
         # Find all article sections - using multiple strategies for robustness
         article_sections = soup.find_all('div', class_=lambda c: c and 'cd' in (c.split() if c else []))
         
@@ -293,7 +304,7 @@ def extract_medium_articles(email_body: str) -> str:
             # Extract article link - using multiple strategies
             # Strategy 1: Find link containing the article title
             if title_elem:
-                link_parent = title_elem.find_parent('a')
+                link_parent = section.select_one('a:has(h2)')
                 if link_parent and 'href' in link_parent.attrs:
                     url_result = _get_short_url(link_parent['href'])
                     if not isinstance(url_result, dict) or "error" not in url_result:
@@ -320,10 +331,10 @@ def extract_medium_articles(email_body: str) -> str:
     except Exception as e:
         # If parsing fails, return empty JSON array
         print(f"Error parsing Medium Daily Digest: {str(e)}")
-        return json.dumps([])
+        return _json_dumps([])
     
     # Return articles as a JSON string
-    return json.dumps(articles)
+    return _json_dumps(articles)
 
 @mcp.tool()
 def get_medium_articles_from_gmail() -> str:
@@ -388,24 +399,30 @@ def get_medium_articles_from_gmail() -> str:
         email_response = get_gmail_message(query=query)
 
         if "error" in email_response:
-            return json.dumps({"error": email_response["error"]})
+            return _json_dumps({"error": email_response["error"]})
 
         # Extract the email body
         email_body = email_response.get("body", "")
         if not email_body:
-            return json.dumps({"error": "Failed to extract email body from the Medium Daily Digest email."})
+            return _json_dumps({"error": "Failed to extract email body from the Medium Daily Digest email."})
 
         # Extract Medium articles from the email body
         articles_response = extract_medium_articles(email_body)
         if not articles_response:
-            return json.dumps({"error": "Failed to extract articles from the Medium Daily Digest email."})
+            return _json_dumps({"error": "Failed to extract articles from the Medium Daily Digest email."})
 
         return articles_response
 
     except Exception as e:
-        return json.dumps({"error": f"Unexpected error: {str(e)}"})
+        return _json_dumps({"error": f"Unexpected error: {str(e)}"})
 
 # Helper Functions
+def _json_dumps(obj):
+    """Serialize obj to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
 def _format_message(msg):
     """
     Extract and format key components from a Gmail API message object.
@@ -483,6 +500,7 @@ def _format_message(msg):
         "body": body
     }
 
+@functools.lru_cache(maxsize=512)
 def _get_short_url(url):
     """
     Extracts the canonical URL from a full Medium article URL by removing tracking parameters.
@@ -493,6 +511,9 @@ def _get_short_url(url):
     scheme, network location (netloc), and path. This ensures that any extra tracking data is removed,
     leaving the clean, canonical URL.
     
+    Results are memoized, since the same tracking URL often appears several times within a
+    single digest (title link, author link, thumbnail). Callers must not mutate the returned value.
+    
     Args:
         url (str): The full Medium article URL, potentially containing query parameters and fragments.
     
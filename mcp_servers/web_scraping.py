@@ -1,27 +1,233 @@
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.prompts import base
 import os
-from datetime import datetime
+import sys
 import json
-from urllib.parse import urlparse
-from playwright.async_api import async_playwright
+import re
+from urllib.parse import urlparse, urlunparse
+from functools import lru_cache
+from collections import OrderedDict
+from html import unescape
+from html.parser import HTMLParser
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from bs4 import BeautifulSoup
 import datetime
+import time
 import asyncio
+import httpx
+from contextlib import asynccontextmanager
+
+# selectolax is optional: its Lexbor engine parses article HTML far faster than BeautifulSoup's html.parser
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Without selectolax, BeautifulSoup runs on lxml's C parser when available instead of the pure-Python html.parser
+try:
+    import lxml
+    BS4_PARSER = "lxml"
+except ImportError:
+    BS4_PARSER = "html.parser"
+
+# orjson is optional: it reads and writes the cookie file several times faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# h2 is optional: with it the shared HTTP connections to Medium negotiate HTTP/2
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# uvloop is optional: its libuv event loop cuts the per-message overhead of many pages in flight at once
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+@asynccontextmanager
+async def _lifespan(server):
+    """Closes the shared browser and HTTP connections when the MCP server shuts down."""
+    try:
+        yield {}
+    finally:
+        await _close_browser()
+        await _close_http_transport()
 
 # Initialize the MCP server
-mcp = FastMCP("Web Scraping MCP Server")
+mcp = FastMCP("Web Scraping MCP Server", lifespan=_lifespan)
 
 # Load environment variables for Medium credentials and cookies file path
 MEDIUM_EMAIL = os.getenv("MEDIUM_EMAIL", "your-email@example.com")
 MEDIUM_PASSWORD = os.getenv("MEDIUM_PASSWORD", "your-password")
 MEDIUM_COOKIES_FILE = os.getenv("MEDIUM_COOKIES_FILE", "medium_cookies.json")
+# Optional Chromium profile directory. When set, scraping runs in one persistent context whose cookies,
+# localStorage and HTTP cache Chromium keeps on disk across server restarts
+MEDIUM_PROFILE_DIR = os.getenv("MEDIUM_PROFILE_DIR")
+# Optional CDP endpoint of an already running Chromium (see run_browser_server.py). When set, every
+# server process connects to that one browser instead of launching its own. A persistent profile
+# needs its own browser, so MEDIUM_PROFILE_DIR takes precedence when both are set
+MEDIUM_CDP_ENDPOINT = os.getenv("MEDIUM_CDP_ENDPOINT")
+if MEDIUM_PROFILE_DIR and MEDIUM_CDP_ENDPOINT:
+    # stderr, since stdout carries the MCP protocol
+    print("Warning: MEDIUM_PROFILE_DIR and MEDIUM_CDP_ENDPOINT are both set; using the profile and ignoring the CDP endpoint",
+          file=sys.stderr)
+# Login form selectors that worked last time, keyed by site, so warm logins try them first
+MEDIUM_SELECTOR_CACHE_FILE = os.getenv(
+    "MEDIUM_SELECTOR_CACHE_FILE",
+    os.path.join(os.path.dirname(MEDIUM_COOKIES_FILE), "medium_selectors.json")
+)
 DEBUG_MODE = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
 
+# Browser context pool settings for article scraping
+POOL_SIZE = int(os.getenv("POOL_SIZE", "4"))
+MAX_USES_PER_CONTEXT = int(os.getenv("MAX_USES_PER_CONTEXT", "50"))
+# Successful scrapes are served from memory for RESULT_CACHE_TTL seconds; RESULT_CACHE_SIZE=0 disables the cache
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "3600"))
+SCRAPER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
+
+# Query parameters that only track where a visit came from; everything else (e.g. the ?sk= friend-link
+# token, which unlocks a member-only article) is part of the article URL and is kept
+_TRACKING_PARAM_RE = re.compile(r"source|utm_\w*|gi|fbclid|gclid|_branch_\w*", re.IGNORECASE)
+
+# Page text markers, each matched case-insensitively in a single pass over the HTML
+_PAYWALL_RE = re.compile(r"sign in|become a member|join medium", re.IGNORECASE)
+_LOGGED_IN_RE = re.compile(r"sign out|your stories|your profile|write a story|account settings", re.IGNORECASE)
+# The logged-in markers live in the navigation bar, so only this much of the <body> is scanned for them
+LOGGED_IN_SCAN_CHARS = 65536
+
+# Markers of article content images: Medium image-CDN URL fragments, and the container classes
+# around inline images (matched as whole class names in a space-joined class list)
+_MEDIUM_IMG_RE = re.compile(r"miro\.medium\.com|/resize:|/max/|/fit:|/progressive:")
+_ARTICLE_CLS_RE = re.compile(r"(?<!\S)(?:graf-image|section-image|post-image|progressiveMedia)(?!\S)")
+
+# Navigations wait for DOMContentLoaded plus the element we actually need, never for network idle:
+# Medium's analytics beacons can keep the network busy for tens of seconds
+NAVIGATION_TIMEOUT_MS = int(os.getenv("NAVIGATION_TIMEOUT_MS", "8000"))
+HOMEPAGE_READY_SELECTOR = 'button[aria-label="User"], div[data-testid="user-menu"], a[href*="sign-in"], a[href*="signin"]'
+ARTICLE_READY_PREDICATE = "document.querySelector('article') && document.querySelectorAll('article p').length > 2"
+
+# Elements only shown to a logged-in member, used to confirm a login
+AUTH_CHECK_SELECTORS = [
+    'button[aria-label="User"]',   # Current avatar button
+    'img.avatar',                  # Avatar image
+    'a[href*="/@"]',               # Profile link
+    'a[href="/me"]',               # "Me" link
+    'button:has-text("Write")',    # Write button (logged-in users)
+    'div[data-testid="user-menu"]' # User menu
+]
+
+# Challenge widgets that block the login flow (case-insensitive attribute matches)
+CAPTCHA_SELECTOR = "iframe[src*='recaptcha'], iframe[src*='hcaptcha'], [class*='captcha' i], [id*='captcha' i]"
+
+# Containers that may hold the article body across Medium's layouts, in the order they are tried
+ARTICLE_SELECTORS = [
+    "article",
+    "div[role='article']",
+    "section.pw-post-body",
+    "section[role='main']",
+    "div.story",
+    "div.meteredContent",
+    "div.postArticle-content",
+    "div.section-inner"
+]
+
+# Inner HTML of the first ARTICLE_SELECTORS match with content, in priority order (a single :is() union
+# would pick by document order, i.e. an outer wrapper first), falling back to <body>; also reports each
+# selector tried, for article_debug
+ARTICLE_HTML_SCRIPT = """(selectors) => {
+    const tried = [];
+    for (const selector of selectors) {
+        const el = document.querySelector(selector);
+        if (!el) {
+            tried.push({selector, found: false});
+            continue;
+        }
+        const html = el.innerHTML;
+        tried.push({selector, found: true, content_length: html.length});
+        if (html.trim()) return {html, tried, bodyFallback: false};
+    }
+    return {html: document.body ? document.body.innerHTML : "", tried, bodyFallback: true};
+}"""
+
+# Article pages are server-rendered, so they are first fetched over plain HTTP with the session cookies;
+# responses smaller than this are treated as challenge or error pages and retried in the browser
+HTTP_ARTICLE_MIN_BYTES = 10 * 1024
+
+# Title, paywall check, document size and (unless paywalled) the ARTICLE_HTML_SCRIPT result gathered in
+# one browser round-trip instead of page.title() plus a full page.content() transfer and a second
+# evaluate; takes [_PAYWALL_RE's pattern, ARTICLE_SELECTORS] as its argument
+PAGE_SNAPSHOT_SCRIPT = """([pattern, selectors]) => {
+    const html = document.documentElement.outerHTML;
+    const snapshot = {title: document.title, paywall: new RegExp(pattern, "i").test(html), htmlLength: html.length};
+    if (!snapshot.paywall) snapshot.article = (%s)(selectors);
+    return snapshot;
+}""" % ARTICLE_HTML_SCRIPT
+
+# Non-empty element labels on the page (first 10 per selector), collected in one call for login debugging;
+# takes a {key: selector} mapping and returns {key: [labels]}
+UI_ELEMENTS_SCRIPT = """(kinds) => {
+    const labels = (selector) => Array.from(document.querySelectorAll(selector))
+        .map((el) => (el.innerText || "").trim()).filter(Boolean).slice(0, 10);
+    return Object.fromEntries(Object.entries(kinds).map(([key, selector]) => [key, labels(selector)]));
+}"""
+
+# Maps each selector to whether its first match is visible (non-empty box, not hidden), using the same
+# test as Playwright; null marks selectors document.querySelector rejects, such as :has-text()
+FIRST_VISIBLE_SCRIPT = """(selectors) => selectors.map((selector) => {
+    let el;
+    try {
+        el = document.querySelector(selector);
+    } catch (err) {
+        return null;
+    }
+    if (!el) return false;
+    const rect = el.getBoundingClientRect();
+    const style = getComputedStyle(el);
+    return rect.width > 0 && rect.height > 0 && style.visibility !== "hidden" && style.display !== "none";
+})"""
+
+# Requests aborted on article pages: only the article markup and <img src> attributes are needed.
+# Login pages are never blocked, since the sign-in dialog may depend on its stylesheets
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "true").lower() == "true"
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+BLOCKED_URL_PARTS = ("google-analytics", "segment.io", "doubleclick", "mixpanel")
+
 # Create screenshots directory if it doesn't exist and DEBUG_MODE is true
 SCREENSHOTS_DIR = "debugging_screenshots"
 if DEBUG_MODE:
     os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
+# Debug screenshots cover only the top of the viewport so very tall articles cannot exhaust memory
+SCREENSHOT_CLIP = {"x": 0, "y": 0, "width": 1280, "height": 2000}
+FAILURE_SCREENSHOT_CLIP = {"x": 0, "y": 0, "width": 1280, "height": 800}
+
+# Shared Playwright driver and Chromium instance, started lazily and reused across tool calls
+_PW = None
+_BROWSER = None
+_BROWSER_LOCK = asyncio.Lock()
+_CONTEXT_POOL = None
+_PROFILE_CONTEXT = None
+# Shared HTTP connection pool for the plain-HTTP fast paths, so repeated fetches reuse open TLS connections
+_HTTP_TRANSPORT = None
+# Held while a scrape logs in, so concurrent calls without a session wait for its cookies instead of all signing in
+_LOGIN_LOCK = asyncio.Lock()
+
+# Parsed contents of MEDIUM_COOKIES_FILE, re-read only when the file's mtime changes
+_COOKIE_CACHE = {"mtime": None, "data": None}
+
+# Scraped articles keyed by canonical URL, least recently used first: {url: (monotonic expiry, result)}
+_RESULT_CACHE = OrderedDict()
+
+# Offset from the monotonic clock to wall-clock time, used to render debug step timestamps
+_WALL_CLOCK_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+# Debug screenshots still being written in the background; drained before their page is closed
+_PENDING_SCREENSHOTS = set()
 
 # Defining Tools
 @mcp.tool()
@@ -30,9 +236,10 @@ async def validate_medium_cookies() -> dict: # The dictionary outputted by the t
     Validates if the saved Medium cookies are still valid.
     
     This tool checks if the Medium cookie file exists, contains valid cookie data,
-    and if the cookies still provide authenticated access to Medium.com. It navigates
-    to Medium.com with the saved cookies and checks for elements that indicate a logged-in
-    state.
+    and if the cookies still provide authenticated access to Medium.com. It requests
+    medium.com/me with the saved cookies and checks whether Medium redirects to the
+    member's profile or to the sign-in page, first over plain HTTP and, only if that
+    is inconclusive, in a pooled browser context.
     
     No parameters are required for this tool.
     
@@ -42,7 +249,7 @@ async def validate_medium_cookies() -> dict: # The dictionary outputted by the t
             - "error": Error message if validation failed, None otherwise
     """
     debug_info = {
-        "timestamp": datetime.datetime.now().isoformat(),
+        "timestamp": datetime.datetime.now().isoformat() if DEBUG_MODE else None,
         "cookies_file": MEDIUM_COOKIES_FILE,
         "file_exists": False,
         "cookies_loaded": False,
@@ -52,14 +259,17 @@ async def validate_medium_cookies() -> dict: # The dictionary outputted by the t
         "errors": []
     }
     
-    def add_debug_step(step_name, details=None):
-        step_info = {
-            "step": step_name,
-            "time": datetime.datetime.now().isoformat(),
-        }
-        if details:
-            step_info["details"] = details
-        debug_info["process_steps"].append(step_info)
+    if DEBUG_MODE:
+        def add_debug_step(step_name, details=None):
+            step_info = {
+                "step": step_name,
+                "time_ns": time.monotonic_ns(),
+            }
+            if details:
+                step_info["details"] = details
+            debug_info["process_steps"].append(step_info)
+    else:
+        add_debug_step = _skip_debug_step
 
     add_debug_step("start_validation")
     
@@ -69,30 +279,27 @@ async def validate_medium_cookies() -> dict: # The dictionary outputted by the t
             error_msg = f"Cookie file not found at {MEDIUM_COOKIES_FILE}"
             debug_info["errors"].append(error_msg)
             add_debug_step("file_check_failed", {"error": error_msg})
-            return {
+            return _with_debug({
                 "valid": False, 
-                "error": error_msg,
-                "debug_info": debug_info if DEBUG_MODE else None
-            }
+                "error": error_msg
+            }, debug_info)
         
         debug_info["file_exists"] = True
         add_debug_step("file_exists")
         
         # Load and validate cookies structure
         try:
-            with open(MEDIUM_COOKIES_FILE, "r") as f:
-                cookies = json.load(f)
+            cookies = _get_cookies()
                 
             # Validate cookie structure
             if not isinstance(cookies, list):
-                error_msg = "Invalid cookie format: expected a list of cookies"
+                error_msg = "Invalid cookie format: expected a list of cookies or a storage state with a cookie list"
                 debug_info["errors"].append(error_msg)
                 add_debug_step("invalid_cookie_format", {"error": error_msg})
-                return {
+                return _with_debug({
                     "valid": False,
-                    "error": error_msg,
-                    "debug_info": debug_info if DEBUG_MODE else None
-                }
+                    "error": error_msg
+                }, debug_info)
             
             # Check for required cookie fields
             required_fields = ["name", "value", "domain"]
@@ -102,11 +309,10 @@ async def validate_medium_cookies() -> dict: # The dictionary outputted by the t
                     error_msg = "Invalid cookie format: each cookie must be a dictionary"
                     debug_info["errors"].append(error_msg)
                     add_debug_step("invalid_cookie_object", {"error": error_msg})
-                    return {
+                    return _with_debug({
                         "valid": False,
-                        "error": error_msg,
-                        "debug_info": debug_info if DEBUG_MODE else None
-                    }
+                        "error": error_msg
+                    }, debug_info)
                 
                 missing = [field for field in required_fields if field not in cookie]
                 if missing:
@@ -116,21 +322,19 @@ async def validate_medium_cookies() -> dict: # The dictionary outputted by the t
                 error_msg = f"Cookies missing required fields: {', '.join(set(missing_fields))}"
                 debug_info["errors"].append(error_msg)
                 add_debug_step("missing_cookie_fields", {"missing_fields": list(set(missing_fields))})
-                return {
+                return _with_debug({
                     "valid": False,
-                    "error": error_msg,
-                    "debug_info": debug_info if DEBUG_MODE else None
-                }
+                    "error": error_msg
+                }, debug_info)
                 
             if not cookies:
                 error_msg = "Cookie file exists but contains no cookies"
                 debug_info["errors"].append(error_msg)
                 add_debug_step("empty_cookies", {"error": error_msg})
-                return {
+                return _with_debug({
                     "valid": False, 
-                    "error": error_msg,
-                    "debug_info": debug_info if DEBUG_MODE else None
-                }
+                    "error": error_msg
+                }, debug_info)
                 
             debug_info["cookies_loaded"] = True
             debug_info["cookie_count"] = len(cookies)
@@ -140,222 +344,158 @@ async def validate_medium_cookies() -> dict: # The dictionary outputted by the t
             error_msg = f"Invalid JSON in cookie file: {str(e)}"
             debug_info["errors"].append(error_msg)
             add_debug_step("json_decode_error", {"error": error_msg})
-            return {
+            return _with_debug({
                 "valid": False,
-                "error": error_msg,
-                "debug_info": debug_info if DEBUG_MODE else None
-            }
+                "error": error_msg
+            }, debug_info)
         except Exception as e:
             error_msg = f"Error loading cookies: {str(e)}"
             debug_info["errors"].append(error_msg)
             add_debug_step("loading_failed", {"error": error_msg})
-            return {
+            return _with_debug({
                 "valid": False, 
-                "error": error_msg,
-                "debug_info": debug_info if DEBUG_MODE else None
-            }
+                "error": error_msg
+            }, debug_info)
+        
+        # Fast path: most sessions can be judged from /me's redirect over plain HTTP
+        http_valid, location = await _probe_me_redirect(cookies)
+        debug_info["http_probe_location"] = location
+        add_debug_step("http_probe", {"valid": http_valid, "location": location})
+        if http_valid is True:
+            add_debug_step("validation_successful")
+            return _with_debug({
+                "valid": True,
+                "error": None
+            }, debug_info)
+        if http_valid is False:
+            error_msg = "Cookie validation failed - Not logged into Medium"
+            debug_info["errors"].append(error_msg)
+            add_debug_step("validation_failed", {"error": error_msg})
+            return _with_debug({
+                "valid": False,
+                "error": error_msg
+            }, debug_info)
         
-        # Validate cookies with Playwright
+        # Validate cookies with a pooled browser context
         add_debug_step("initializing_playwright")
-        async with async_playwright() as p:
+        try:
+            pool = await _get_context_pool()
+            context = await pool.acquire()
+            add_debug_step("context_acquired")
+            
+            # Pooled contexts may hold an older session, so load the file's cookies explicitly; the
+            # persistent profile context is left alone, since cookies added to it are written to the profile
+            # on disk and the file's session may be older than the one the profile holds
             try:
-                browser = await p.chromium.launch(headless=not DEBUG_MODE)
-                add_debug_step("browser_launched")
-                
-                context = await browser.new_context(
-                    viewport={"width": 1920, "height": 1080},
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                )
-                add_debug_step("context_created")
-                
-                # Add cookies to the context with error handling
-                try:
+                if context is pool.shared_context:
+                    add_debug_step("cookies_add_skipped", {"reason": "persistent profile context"})
+                else:
                     await context.add_cookies(cookies)
                     add_debug_step("cookies_added_to_context")
-                except Exception as e:
-                    error_msg = f"Failed to add cookies to browser context: {str(e)}"
-                    debug_info["errors"].append(error_msg)
-                    add_debug_step("cookie_add_failed", {"error": error_msg})
-                    return {
-                        "valid": False,
-                        "error": error_msg,
-                        "debug_info": debug_info if DEBUG_MODE else None
-                    }
-                
-                page = await context.new_page()
-                add_debug_step("page_created")
+            except Exception as e:
+                error_msg = f"Failed to add cookies to browser context: {str(e)}"
+                debug_info["errors"].append(error_msg)
+                add_debug_step("cookie_add_failed", {"error": error_msg})
+                return _with_debug({
+                    "valid": False,
+                    "error": error_msg
+                }, debug_info)
+            
+            # Only the redirect and the HTML matter here, so heavy resources are blocked as on article pages
+            page = await pool.new_page(context)
+            add_debug_step("page_created", {"resources_blocked": pool.block_resources})
+            
+            try:
+                # /me redirects to the member's profile (/@username) when logged in and to the
+                # sign-in page otherwise, so the final URL alone answers the question
+                add_debug_step("navigating_to_medium")
+                await page.goto("https://medium.com/me", wait_until="domcontentloaded", timeout=30000)
+                final_url = page.url
+                debug_info["final_url"] = final_url
+                add_debug_step("redirect_resolved", {"url": final_url})
                 
-                try:
-                    # Navigate with timeout and error handling
-                    add_debug_step("navigating_to_medium")
-                    await page.goto("https://medium.com", wait_until="networkidle", timeout=30000)
-                    
-                    # Wait for the page to be fully loaded
-                    await page.wait_for_load_state("networkidle", timeout=10000)
-                    
-                    # Try multiple authentication check approaches
-                    auth_checks = {
-                        "primary": [
-                            'button[aria-label="User"]',
-                            'div[data-testid="user-menu"]',
-                            'a[href="/me"]'
-                        ],
-                        "secondary": [
-                            'img.avatar',
-                            'a[href*="/@"]',
-                            'button:has-text("Write")',
-                            'div[aria-label="Profile"]',
-                            'img[alt*="Profile picture"]'
-                        ],
-                        "fallback": [
-                            'button:has-text("Notifications")',
-                            'button:has-text("Lists")',
-                            'button:has-text("Stories")',
-                            'a:has-text("Member")',
-                            'a:has-text("profile")'
-                        ]
-                    }
-                    
-                    # Add HTML content check as fallback
+                final_path = urlparse(final_url).path
+                if final_path.startswith("/@"):
+                    logged_in = True
+                    add_debug_step("authentication_confirmed", {"url": final_url})
+                elif "signin" in final_url or "sign-in" in final_url:
                     logged_in = False
-                    found_selector = None
-                    auth_check_results = []
-                    
-                    # Try primary selectors first
-                    for check_type, selectors in auth_checks.items():
-                        for selector in selectors:
-                            try:
-                                element_count = await page.locator(selector).count()
-                                is_visible = False
-                                if element_count > 0:
-                                    first_element = page.locator(selector).first
-                                    try:
-                                        is_visible = await first_element.is_visible()
-                                    except Exception as e:
-                                        auth_check_results.append({
-                                            "type": check_type,
-                                            "selector": selector,
-                                            "found": True,
-                                            "visible": False,
-                                            "error": str(e)
-                                        })
-                                        continue
-
-                                    if is_visible:
-                                        logged_in = True
-                                        found_selector = selector
-                                        add_debug_step("authentication_confirmed", {
-                                            "selector": selector,
-                                            "type": check_type
-                                        })
-                                        break
-                                
-                                auth_check_results.append({
-                                    "type": check_type,
-                                    "selector": selector,
-                                    "found": element_count > 0,
-                                    "visible": is_visible
-                                })
-                                
-                            except Exception as e:
-                                auth_check_results.append({
-                                    "type": check_type,
-                                    "selector": selector,
-                                    "error": str(e)
-                                })
-                                add_debug_step("selector_check_failed", {
-                                    "selector": selector,
-                                    "type": check_type,
-                                    "error": str(e)
-                                })
-                        
-                        if logged_in:
-                            break
-                    
-                    # Content-based authentication check if selectors didn't work
-                    if not logged_in:
-                        add_debug_step("trying_content_based_check")
-                        try:
-                            page_content = await page.content()
-                            logged_in_indicators = [
-                                "Sign out",
-                                "Your stories",
-                                "Your profile",
-                                "Write a story",
-                                "Account settings"
-                            ]
+                else:
+                    # Unexpected landing page: fall back to the navigation bar text
+                    add_debug_step("trying_content_based_check")
+                    logged_in = False
+                    try:
+                        page_content = await page.content()
+                        # Scan only the start of the body (where the nav bar is), skipping the inline <head> assets
+                        body_start = max(page_content.find("<body"), 0)
+                        indicator = _LOGGED_IN_RE.search(page_content, body_start, body_start + LOGGED_IN_SCAN_CHARS)
+                        if indicator:
+                            logged_in = True
+                            add_debug_step("content_check_authenticated", {"indicator": indicator.group(0)})
                             
-                            for indicator in logged_in_indicators:
-                                if indicator.lower() in page_content.lower():
-                                    logged_in = True
-                                    add_debug_step("content_check_authenticated", {"indicator": indicator})
-                                    break
-                                
-                        except Exception as e:
-                            add_debug_step("content_check_failed", {"error": str(e)})
-                    
-                    # Take screenshot for debugging if enabled
-                    screenshot_path = await _take_screenshot(page, "cookie_validation")
-                    if screenshot_path:
-                        debug_info["screenshots"].append(screenshot_path)
-                    add_debug_step("screenshot_taken", {"path": screenshot_path} if screenshot_path else {"skipped": True})
-                    
-                    # Add authentication check results to debug info
-                    debug_info["auth_check_results"] = auth_check_results
-                    
-                    if logged_in:
-                        add_debug_step("validation_successful")
-                        return {
-                            "valid": True, 
-                            "error": None,
-                            "debug_info": debug_info if DEBUG_MODE else None
-                        }
-                    else:
-                        error_msg = "Cookie validation failed - Not logged into Medium"
-                        debug_info["errors"].append(error_msg)
-                        add_debug_step("validation_failed", {"error": error_msg})
-                        return {
-                            "valid": False, 
-                            "error": error_msg,
-                            "debug_info": debug_info if DEBUG_MODE else None
-                        }
-                        
-                except Exception as e:
-                    error_msg = f"Error during page navigation or validation: {str(e)}"
+                    except Exception as e:
+                        add_debug_step("content_check_failed", {"error": str(e)})
+                
+                # Take screenshot for debugging if enabled
+                screenshot_path = _take_screenshot(page, "cookie_validation")
+                if screenshot_path:
+                    debug_info["screenshots"].append(screenshot_path)
+                add_debug_step("screenshot_taken", {"path": screenshot_path} if screenshot_path else {"skipped": True})
+                
+                if logged_in:
+                    add_debug_step("validation_successful")
+                    return _with_debug({
+                        "valid": True, 
+                        "error": None
+                    }, debug_info)
+                else:
+                    error_msg = "Cookie validation failed - Not logged into Medium"
                     debug_info["errors"].append(error_msg)
-                    add_debug_step("validation_exception", {"error": error_msg})
-                    return {
+                    add_debug_step("validation_failed", {"error": error_msg})
+                    return _with_debug({
                         "valid": False, 
-                        "error": error_msg,
-                        "debug_info": debug_info if DEBUG_MODE else None
-                    }
-                finally:
-                    await page.close()
-                    add_debug_step("page_closed")
+                        "error": error_msg
+                    }, debug_info)
                     
             except Exception as e:
-                error_msg = f"Browser automation error: {str(e)}"
+                error_msg = f"Error during page navigation or validation: {str(e)}"
                 debug_info["errors"].append(error_msg)
-                add_debug_step("browser_error", {"error": error_msg})
-                return {
+                add_debug_step("validation_exception", {"error": error_msg})
+                return _with_debug({
                     "valid": False, 
-                    "error": error_msg,
-                    "debug_info": debug_info if DEBUG_MODE else None
-                }
-            finally:
-                if 'browser' in locals():
-                    await browser.close()
-                    add_debug_step("browser_closed")
+                    "error": error_msg
+                }, debug_info)
+                
+        except Exception as e:
+            error_msg = f"Browser automation error: {str(e)}"
+            debug_info["errors"].append(error_msg)
+            add_debug_step("browser_error", {"error": error_msg})
+            return _with_debug({
+                "valid": False, 
+                "error": error_msg
+            }, debug_info)
+        finally:
+            # Close the page while the context goes back to the pool for the next scrape
+            cleanup = []
+            if 'page' in locals():
+                cleanup.append(_close_page(page))
+            if 'context' in locals():
+                cleanup.append(pool.release(context))
+            if cleanup:
+                await asyncio.gather(*cleanup, return_exceptions=True)
+                add_debug_step("context_released")
+            if DEBUG_MODE:
+                # Steps recorded during cleanup land after the result was built; stamp them too
+                _format_step_times(debug_info)
                     
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
         debug_info["errors"].append(error_msg)
         add_debug_step("unexpected_error", {"error": error_msg})
-        return {
+        return _with_debug({
             "valid": False, 
-            "error": error_msg,
-            "debug_info": debug_info if DEBUG_MODE else None
-        }
+            "error": error_msg
+        }, debug_info)
 
 @mcp.tool()
 async def scrape_medium_article_content(short_url: str) -> dict: # The dictionary outputted by the tool will have a "debug_info" key containing the debug information if DEBUG_MODE is true and there is an error 
@@ -364,7 +504,8 @@ async def scrape_medium_article_content(short_url: str) -> dict: # The dictionar
     
     This tool navigates to a Medium article, ensures proper authentication using saved session cookies or
     performing a login if necessary, and extracts the article's content, including the title, full text with
-    inline image placeholders, and all image URLs present in the article.
+    inline image placeholders, and all image URLs present in the article. The article is first requested
+    over plain HTTP with the session cookies; the browser only renders it when that response is unusable.
     
     Args:
         short_url: The canonical URL of the Medium article to scrape. This should be the clean URL without
@@ -398,9 +539,39 @@ async def scrape_medium_article_content(short_url: str) -> dict: # The dictionar
         - Browser/Playwright error:
           {"error": "Browser automation error: [details]"}
     """
+    return await _scrape_article(short_url)
+
+@mcp.tool()
+async def scrape_medium_articles_batch(short_urls: list[str], max_concurrency: int = 5) -> list[dict]: # Each result carries its own "debug_info" key under the same conditions as scrape_medium_article_content
+    """
+    Scrapes several Medium articles concurrently, sharing the browser context pool.
+    
+    Each article is scraped exactly as scrape_medium_article_content would, with at most
+    max_concurrency (and never more than POOL_SIZE) articles in flight at once; one failing article
+    does not affect the others.
+    
+    Args:
+        short_urls: The canonical URLs of the Medium articles to scrape.
+        max_concurrency: The maximum number of articles scraped at the same time (default 5).
+    
+    Returns:
+        list: One result per URL, in the same order, each shaped like the result of
+              scrape_medium_article_content (article details, or a dictionary with an "error" key).
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def scrape_one(short_url):
+        async with semaphore:
+            return await _scrape_article(short_url)
+    
+    return await asyncio.gather(*(scrape_one(short_url) for short_url in short_urls))
+
+# Helper Functions
+async def _scrape_article(short_url):
+    """Scrapes one article for scrape_medium_article_content and scrape_medium_articles_batch; see the former."""
     # Initialize debugging info
     debug_info = {
-        "timestamp": datetime.datetime.now().isoformat(),
+        "timestamp": datetime.datetime.now().isoformat() if DEBUG_MODE else None,
         "url": short_url,
         "screenshots": [],
         "process_steps": [],
@@ -413,14 +584,17 @@ async def scrape_medium_article_content(short_url: str) -> dict: # The dictionar
         "errors": []
     }
     
-    def add_debug_step(step_name, details=None):
-        step_info = {
-            "step": step_name,
-            "time": datetime.datetime.now().isoformat(),
-        }
-        if details:
-            step_info["details"] = details
-        debug_info["process_steps"].append(step_info)
+    if DEBUG_MODE:
+        def add_debug_step(step_name, details=None):
+            step_info = {
+                "step": step_name,
+                "time_ns": time.monotonic_ns(),
+            }
+            if details:
+                step_info["details"] = details
+            debug_info["process_steps"].append(step_info)
+    else:
+        add_debug_step = _skip_debug_step
     
     try:
         add_debug_step("start", {"url": short_url})
@@ -428,213 +602,768 @@ async def scrape_medium_article_content(short_url: str) -> dict: # The dictionar
         # Validate URL format
         if not short_url or not isinstance(short_url, str):
             debug_info["errors"].append("Invalid URL: URL must be a non-empty string")
-            return {
+            return _with_debug({
                 "error": "Invalid URL: URL must be a non-empty string", 
-                "debug_info": debug_info if DEBUG_MODE else None
-            }
+            }, debug_info)
         
-        parts = urlparse(short_url)
-        if not parts.scheme or not parts.netloc:
+        short_url = _canonicalize_url(short_url)
+        if short_url is None:
             debug_info["errors"].append("Invalid URL: Missing scheme or domain")
-            return {
+            return _with_debug({
                 "error": "Invalid URL: Missing scheme or domain", 
-                "debug_info": debug_info if DEBUG_MODE else None
-            }
+            }, debug_info)
+        
+        # Articles rarely change, so a recent scrape of the same URL is returned without touching the browser
+        cached = _get_cached_result(short_url)
+        if cached is not None:
+            add_debug_step("result_cache_hit")
+            return _with_debug(cached, debug_info)
         
         # Initialize playwright and scrape the article
         add_debug_step("initializing_playwright")
-        async with async_playwright() as p:
-            try:
-                # Use headless mode based on DEBUG_MODE
-                browser = await p.chromium.launch(headless=not DEBUG_MODE)
-                add_debug_step("browser_launched", {"headless": not DEBUG_MODE})
-                
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36"
-                )
-                add_debug_step("context_created")
-                
-                # Attempt to restore session from cookies; if unavailable, perform login
-                cookies_loaded = await _load_cookies(context)
-                debug_info["cookies_loaded"] = cookies_loaded
-                add_debug_step("cookies_load_attempt", {"success": cookies_loaded})
-                
-                if not cookies_loaded:
-                    add_debug_step("login_required")
-                    page = await context.new_page()
-                    debug_info["login_attempted"] = True
-                    
-                    # Take screenshot at the beginning
-                    screenshot_path = await _take_screenshot(page, "login_start")
-                    if screenshot_path:
-                        debug_info["screenshots"].append(screenshot_path)
-                    
-                    try:
-                        login_result = await _login_medium(page)
-                        debug_info["login_successful"] = login_result["authenticated"]
-                        add_debug_step("login_attempt", login_result)
-                        
-                        if login_result["authenticated"]:
-                            cookies_saved = await _save_cookies(context)
-                            debug_info["cookies_saved"] = cookies_saved
-                            add_debug_step("cookies_saved", {"success": cookies_saved})
-                        else:
-                            debug_info["errors"].append(f"Failed to authenticate with Medium: {login_result['error']}")
-                            # Take a screenshot of the failed login state
-                            screenshot_path = await _take_screenshot(page, "login_failed")
-                            if screenshot_path:
-                                debug_info["screenshots"].append(screenshot_path)
-                            
-                            return {
-                                "error": f"Failed to authenticate with Medium: {login_result['error']}",
-                                "debug_info": debug_info if DEBUG_MODE else None
-                            }
-                    except Exception as e:
-                        error_msg = str(e)
-                        debug_info["errors"].append(f"Login exception: {error_msg}")
-                        add_debug_step("login_exception", {"error": error_msg})
+        try:
+            # Use headless mode based on DEBUG_MODE
+            login_page_close = None
+            article_page = None
+            pool = await _get_context_pool()
+            context = await pool.acquire()
+            add_debug_step("context_acquired", {"headless": not DEBUG_MODE})
+            
+            # Attempt to restore session from cookies; if unavailable, perform login
+            cookies_loaded = await pool.ensure_cookies(context)
+            debug_info["cookies_loaded"] = cookies_loaded
+            add_debug_step("cookies_load_attempt", {"success": cookies_loaded})
+            
+            if not cookies_loaded:
+                # One login at a time: scrapes queued behind it pick up the session it saves
+                async with _LOGIN_LOCK:
+                    cookies_loaded = await pool.ensure_cookies(context)
+                    if cookies_loaded:
+                        add_debug_step("cookies_loaded_after_wait")
+                    else:
+                        add_debug_step("login_required")
+                        page = await pool.new_page(context, block_resources=False)
+                        debug_info["login_attempted"] = True
                         
-                        # Take a screenshot of the error state
-                        screenshot_path = await _take_screenshot(page, "login_exception")
+                        # Take screenshot at the beginning
+                        screenshot_path = _take_screenshot(page, "login_start")
                         if screenshot_path:
                             debug_info["screenshots"].append(screenshot_path)
                         
-                        return {
-                            "error": f"Failed to authenticate with Medium: {error_msg}",
-                            "debug_info": debug_info if DEBUG_MODE else None
-                        }
-                    finally:
-                        await page.close()
-                        add_debug_step("login_page_closed")
+                        try:
+                            login_result = await _login_medium(page)
+                            debug_info["login_successful"] = login_result["authenticated"]
+                            add_debug_step("login_attempt", login_result)
+                            
+                            if login_result["authenticated"]:
+                                pool.mark_authenticated(context)
+                                cookies_saved = await _save_cookies(context)
+                                debug_info["cookies_saved"] = cookies_saved
+                                add_debug_step("cookies_saved", {"success": cookies_saved})
+                            else:
+                                debug_info["errors"].append(f"Failed to authenticate with Medium: {login_result['error']}")
+                                # Take a screenshot of the failed login state
+                                screenshot_path = _take_screenshot(page, "login_failed", failure=True)
+                                if screenshot_path:
+                                    debug_info["screenshots"].append(screenshot_path)
+                                
+                                return _with_debug({
+                                    "error": f"Failed to authenticate with Medium: {login_result['error']}"
+                                }, debug_info)
+                        except Exception as e:
+                            error_msg = str(e)
+                            debug_info["errors"].append(f"Login exception: {error_msg}")
+                            add_debug_step("login_exception", {"error": error_msg})
+                            
+                            # Take a screenshot of the error state
+                            screenshot_path = _take_screenshot(page, "login_exception", failure=True)
+                            if screenshot_path:
+                                debug_info["screenshots"].append(screenshot_path)
+                            
+                            return _with_debug({
+                                "error": f"Failed to authenticate with Medium: {error_msg}"
+                            }, debug_info)
+                        finally:
+                            # Close the login page in the background while the article page is set up
+                            login_page_close = asyncio.create_task(_close_page(page))
+                            add_debug_step("login_page_close_started")
+            
+            # Fast path: fetch the server-rendered article over HTTP with the context's cookies
+            add_debug_step("fetching_article_over_http", {"url": short_url})
+            article_data = await _fetch_article_http(context, short_url)
+            if article_data is not None:
+                debug_info["page_title"] = article_data["Name"]
+                if DEBUG_MODE:
+                    debug_info["html_content_length"] = article_data["article_debug"]["content_length"]
+                    article_data["debug_info"] = debug_info
+                add_debug_step("completed", {
+                    "source": "http",
+                    "has_title": bool(article_data.get("Name")),
+                    "content_length": len(article_data.get("Scraped text", "")),
+                    "image_count": len(article_data.get("Images", []))
+                })
+                _cache_result(short_url, article_data)
+                return article_data
+            add_debug_step("http_fetch_fallback")
+            
+            # Reuse an idle article page of this context, or open one
+            add_debug_step("creating_article_page")
+            page = article_page = await pool.article_page(context)
+            
+            try:
+                # Go directly to try accessing the article
+                add_debug_step("navigating_to_article", {"url": short_url})
+                await page.goto(short_url, wait_until="commit")
                 
-                # Use a new page for scraping the article
-                add_debug_step("creating_article_page")
-                page = await context.new_page()
+                # Once the navigation has committed the article document is in place, so a slow
+                # domcontentloaded (a straggling subresource) only cuts the wait short instead of failing
+                try:
+                    await page.wait_for_load_state("domcontentloaded")
+                except PlaywrightTimeoutError:
+                    add_debug_step("article_load_timeout")
                 
+                # Wait until the article body has hydrated rather than for the network to go quiet;
+                # the timeout only caps the wait for articles that never match the predicate
                 try:
-                    # Go directly to try accessing the article
-                    add_debug_step("navigating_to_article", {"url": short_url})
-                    await page.goto(short_url, wait_until="networkidle")
-                    
-                    # Wait longer for dynamic content to load
-                    await page.wait_for_load_state("networkidle")
-                    await asyncio.sleep(3)
+                    await page.wait_for_function(ARTICLE_READY_PREDICATE, timeout=5000)
+                except PlaywrightTimeoutError:
+                    add_debug_step("article_wait_timeout")
+                
+                # Take a screenshot of what we're seeing
+                screenshot_path = _take_screenshot(page, "article_page")
+                if screenshot_path:
+                    debug_info["screenshots"].append(screenshot_path)
+                
+                # Get the page title and check for a login page or paywall without pulling the HTML out of the browser
+                snapshot = await page.evaluate(PAGE_SNAPSHOT_SCRIPT, [_PAYWALL_RE.pattern, ARTICLE_SELECTORS])
+                page_title = snapshot["title"]
+                debug_info["page_title"] = page_title
+                debug_info["html_content_length"] = snapshot["htmlLength"]
+                add_debug_step("page_loaded", {"title": page_title})
+                
+                is_login_page = snapshot["paywall"]
+                
+                if is_login_page:
+                    debug_info["errors"].append("Authentication failed: Redirected to login page or hit a paywall")
+                    add_debug_step("auth_check_failed", {"is_login_page": True})
+                    return _with_debug({
+                        "error": "Authentication failed: Redirected to login page or hit a paywall"
+                    }, debug_info)
+                
+                add_debug_step("auth_check_passed", {"is_login_page": False})
+                
+                # Scrape the article content
+                add_debug_step("scraping_article_content")
+                article_data = await _scrape_medium_article(page, short_url, snapshot=snapshot)
+                
+                # Check for article content
+                if not article_data.get("Name"):
+                    debug_info["errors"].append("Failed to extract article title")
+                    add_debug_step("title_extraction_failed")
                     
-                    # Take a screenshot of what we're seeing
-                    screenshot_path = await _take_screenshot(page, "article_page")
+                    # Take a screenshot of the page for debugging
+                    screenshot_path = _take_screenshot(page, "title_extraction_failed", failure=True)
                     if screenshot_path:
                         debug_info["screenshots"].append(screenshot_path)
+                
+                if not article_data.get("Scraped text"):
+                    debug_info["errors"].append("Failed to extract article content")
+                    add_debug_step("content_extraction_failed")
                     
-                    # Get page title
-                    page_title = await page.title()
-                    debug_info["page_title"] = page_title
-                    add_debug_step("page_loaded", {"title": page_title})
-                    
-                    # Verify we're not on a login page or paywall
-                    page_content = await page.content()
-                    is_login_page = any(phrase in page_content.lower() 
-                                       for phrase in ["sign in", "become a member", "join medium"])
-                    
-                    if is_login_page:
-                        debug_info["errors"].append("Authentication failed: Redirected to login page or hit a paywall")
-                        add_debug_step("auth_check_failed", {"is_login_page": True})
-                        return {
-                            "error": "Authentication failed: Redirected to login page or hit a paywall",
-                            "debug_info": debug_info if DEBUG_MODE else None
-                        }
-                    
-                    add_debug_step("auth_check_passed", {"is_login_page": False})
-                    
-                    # Scrape the article content
-                    add_debug_step("scraping_article_content")
-                    article_data = await _scrape_medium_article(page, short_url)
-                    
-                    # Add debug information to article data
-                    debug_info["html_content_length"] = len(await page.content())
-                    
-                    # Check for article content
-                    if not article_data.get("Name"):
-                        debug_info["errors"].append("Failed to extract article title")
-                        add_debug_step("title_extraction_failed")
-                        
-                        # Take a screenshot of the page for debugging
-                        screenshot_path = await _take_screenshot(page, "title_extraction_failed")
-                        if screenshot_path:
-                            debug_info["screenshots"].append(screenshot_path)
-                    
-                    if not article_data.get("Scraped text"):
-                        debug_info["errors"].append("Failed to extract article content")
-                        add_debug_step("content_extraction_failed")
-                        
-                        # Take a screenshot of the page for debugging
-                        screenshot_path = await _take_screenshot(page, "content_extraction_failed")
-                        if screenshot_path:
-                            debug_info["screenshots"].append(screenshot_path)
-                    
-                    # Always include debug info in article data during debug mode
-                    if DEBUG_MODE:
-                        article_data["debug_info"] = debug_info
-                    
-                    add_debug_step("completed", {
-                        "has_title": bool(article_data.get("Name")),
-                        "content_length": len(article_data.get("Scraped text", "")),
-                        "image_count": len(article_data.get("Images", []))
-                    })
-                    
-                    return article_data
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    debug_info["errors"].append(f"Article extraction error: {error_msg}")
-                    add_debug_step("article_extraction_exception", {"error": error_msg})
-                    
-                    # Take a screenshot of the error state
-                    screenshot_path = await _take_screenshot(page, "article_extraction_error")
+                    # Take a screenshot of the page for debugging
+                    screenshot_path = _take_screenshot(page, "content_extraction_failed", failure=True)
                     if screenshot_path:
                         debug_info["screenshots"].append(screenshot_path)
-                    
-                    return {
-                        "error": f"Failed to extract article content: {error_msg}",
-                        "debug_info": debug_info if DEBUG_MODE else None
-                    }
-                finally:
-                    await page.close()
-                    add_debug_step("article_page_closed")
+                
+                # Always include debug info in article data during debug mode
+                if DEBUG_MODE:
+                    article_data["debug_info"] = debug_info
+                
+                add_debug_step("completed", {
+                    "has_title": bool(article_data.get("Name")),
+                    "content_length": len(article_data.get("Scraped text", "")),
+                    "image_count": len(article_data.get("Images", []))
+                })
+                
+                _cache_result(short_url, article_data)
+                return article_data
+                
             except Exception as e:
                 error_msg = str(e)
-                debug_info["errors"].append(f"Browser automation error: {error_msg}")
-                add_debug_step("browser_automation_error", {"error": error_msg})
-                return {
-                    "error": f"Browser automation error: {error_msg}",
-                    "debug_info": debug_info if DEBUG_MODE else None
-                }
-            finally:
-                if 'browser' in locals():
-                    await browser.close()
-                    add_debug_step("browser_closed")
+                debug_info["errors"].append(f"Article extraction error: {error_msg}")
+                add_debug_step("article_extraction_exception", {"error": error_msg})
+                
+                # Take a screenshot of the error state
+                screenshot_path = _take_screenshot(page, "article_extraction_error", failure=True)
+                if screenshot_path:
+                    debug_info["screenshots"].append(screenshot_path)
+                
+                return _with_debug({
+                    "error": f"Failed to extract article content: {error_msg}"
+                }, debug_info)
+        except Exception as e:
+            error_msg = str(e)
+            debug_info["errors"].append(f"Browser automation error: {error_msg}")
+            add_debug_step("browser_automation_error", {"error": error_msg})
+            return _with_debug({
+                "error": f"Browser automation error: {error_msg}"
+            }, debug_info)
+        finally:
+            # Close the login page and hand the article page back for reuse, then return the context
+            # to the pool; the shared browser stays up for the next call
+            cleanup = []
+            if login_page_close is not None:
+                cleanup.append(login_page_close)
+            if article_page is not None:
+                cleanup.append(pool.release_page(context, article_page))
+            if cleanup:
+                await asyncio.gather(*cleanup, return_exceptions=True)
+                add_debug_step("pages_released")
+            if 'context' in locals():
+                await pool.release(context)
+                add_debug_step("context_released")
+            if DEBUG_MODE:
+                # Steps recorded during cleanup land after the result was built; stamp them too
+                _format_step_times(debug_info)
     except Exception as e:
         error_msg = str(e)
         debug_info["errors"].append(f"Unexpected error: {error_msg}")
         add_debug_step("unexpected_error", {"error": error_msg})
-        return {
-            "error": f"Unexpected error: {error_msg}",
-            "debug_info": debug_info if DEBUG_MODE else None
-        }
+        return _with_debug({
+            "error": f"Unexpected error: {error_msg}"
+        }, debug_info)
 
-# Helper Functions
-async def _take_screenshot(page, name):
-    """Helper function to take screenshots only when DEBUG_MODE is True"""
+def _get_cached_result(url):
+    """Returns a copy of the cached scrape of a canonical URL, or None if there is none or it expired."""
+    entry = _RESULT_CACHE.get(url)
+    if entry is None:
+        return None
+    expires, result = entry
+    if expires <= time.monotonic():
+        del _RESULT_CACHE[url]
+        return None
+    _RESULT_CACHE.move_to_end(url)
+    return _copy_result(result)
+
+def _cache_result(url, result):
+    """Caches a scrape that produced both a title and text, evicting the least recently used entries beyond RESULT_CACHE_SIZE."""
+    if RESULT_CACHE_SIZE <= 0 or not result.get("Name") or not result.get("Scraped text"):
+        return
+    entry = _copy_result({key: value for key, value in result.items() if key != "debug_info"})
+    _RESULT_CACHE[url] = (time.monotonic() + RESULT_CACHE_TTL, entry)
+    _RESULT_CACHE.move_to_end(url)
+    while len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+        _RESULT_CACHE.popitem(last=False)
+
+def _copy_result(result):
+    """Copies a scrape result together with its nested list and dict, so cache entries never share them with callers."""
+    copied = {**result, "Images": list(result.get("Images", []))}
+    if isinstance(result.get("article_debug"), dict):
+        copied["article_debug"] = dict(result["article_debug"])
+    return copied
+
+@lru_cache(maxsize=1024)
+def _canonicalize_url(url):
+    """
+    Returns the article URL without tracking parameters or fragment, or None if invalid.
+    
+    Other query parameters are kept as they were written, so friend links (?sk=...) still unlock the
+    article and stay separate result-cache entries. Memoized, so retries and repeated batch entries
+    for the same URL skip parsing it again.
+    """
+    parts = urlparse(url)
+    if not parts.scheme or not parts.netloc:
+        return None
+    query = "&".join(
+        pair for pair in parts.query.split("&")
+        if pair and not _TRACKING_PARAM_RE.fullmatch(pair.split("=", 1)[0])
+    )
+    return urlunparse((parts.scheme, parts.netloc, parts.path, parts.params, query, ""))
+
+def _skip_debug_step(step_name, details=None):
+    """No-op stand-in for the per-call debug step recorders when DEBUG_MODE is off."""
+
+def _skip_screenshot(name, failure=False, step=None):
+    """No-op stand-in for _login_medium's screenshot recorder when DEBUG_MODE is off."""
+
+def _with_debug(result, debug_info):
+    """Attaches debug_info to a tool result under the "debug_info" key, only when DEBUG_MODE is on."""
+    if DEBUG_MODE:
+        _format_step_times(debug_info)
+        result["debug_info"] = debug_info
+    return result
+
+def _format_step_times(obj):
+    """Replaces the raw "time_ns" stamps recorded by the debug step helpers with ISO timestamps, in place."""
+    if isinstance(obj, dict):
+        if "time_ns" in obj:
+            obj["time"] = datetime.datetime.fromtimestamp((obj.pop("time_ns") + _WALL_CLOCK_OFFSET_NS) / 1e9).isoformat()
+        for value in obj.values():
+            _format_step_times(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            _format_step_times(item)
+
+async def _get_browser():
+    """
+    Returns the shared Chromium browser, launching it on first use.
+    
+    Launching Chromium is the dominant cost of a short scrape, so a single browser is kept alive
+    for the lifetime of the MCP server and each tool call only creates its own BrowserContext.
+    The browser is relaunched if it has been disconnected (e.g. after a crash).
+    
+    When MEDIUM_CDP_ENDPOINT is set, the browser is an external Chromium shared with other server
+    processes; it is connected to rather than launched, and closing it only disconnects.
+    """
+    global _PW, _BROWSER
+    async with _BROWSER_LOCK:
+        if _BROWSER is not None and _BROWSER.is_connected():
+            return _BROWSER
+        if _PW is None:
+            _PW = await async_playwright().start()
+        if MEDIUM_CDP_ENDPOINT:
+            _BROWSER = await _PW.chromium.connect_over_cdp(MEDIUM_CDP_ENDPOINT)
+        else:
+            _BROWSER = await _PW.chromium.launch(headless=not DEBUG_MODE)
+        return _BROWSER
+
+class _ContextPool:
+    """
+    Bounded pool of reusable, cookie-loaded BrowserContexts used for article scraping.
+    
+    Contexts are created lazily up to `size` and handed out to one caller at a time. Each context
+    is closed and replaced after `max_uses` scrapes, which keeps the memory held by long-running
+    MCP servers bounded.
+    
+    When `shared_context` is given (the persistent profile context), every caller gets that same
+    context, `size` only bounds how many callers use it at once, and it is never recycled.
+    
+    Pages opened through new_page() abort image, media, font, stylesheet and tracker requests when
+    `block_resources` is True; the routing is per page so login pages in the same context load fully.
+    Article pages handed back through release_page() stay open and are reused by the context's next
+    scrape, so batches navigate a few long-lived pages instead of opening one per URL.
+    """
+    def __init__(self, browser, size, max_uses, shared_context=None, block_resources=True):
+        self.browser = browser
+        self.shared_context = shared_context
+        self.block_resources = block_resources
+        self._max_uses = max_uses
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+        self._uses = {}
+        self._cookies_loaded = {}
+        self._idle_pages = {}
+    
+    async def acquire(self):
+        """Waits for a free slot and returns an idle context, creating one if none is idle."""
+        await self._slots.acquire()
+        try:
+            if self.shared_context is not None:
+                return self.shared_context
+            if self._idle:
+                return self._idle.pop()
+            # Start from the saved storage state (cookies plus localStorage), or empty if it is unusable
+            state = _get_storage_state()
+            try:
+                context = await self.browser.new_context(user_agent=SCRAPER_USER_AGENT, storage_state=state)
+            except Exception:
+                state = None
+                context = await self.browser.new_context(user_agent=SCRAPER_USER_AGENT)
+            self._uses[context] = 0
+            self._cookies_loaded[context] = bool(state and state["cookies"])
+            return context
+        except Exception:
+            self._slots.release()
+            raise
+    
+    async def release(self, context):
+        """Returns a context to the pool, closing it instead once it has reached its use limit."""
+        try:
+            if context is self.shared_context:
+                return
+            self._uses[context] = self._uses.get(context, 0) + 1
+            if self._uses[context] >= self._max_uses or not self.browser.is_connected():
+                self._uses.pop(context, None)
+                self._cookies_loaded.pop(context, None)
+                self._idle_pages.pop(context, None)
+                try:
+                    # Debug screenshots of its pages may still be in flight (e.g. released alongside _close_page)
+                    await _wait_for_screenshots()
+                    await context.close()
+                except Exception:
+                    pass
+            else:
+                self._idle.append(context)
+        finally:
+            self._slots.release()
+    
+    async def ensure_cookies(self, context):
+        """
+        Returns True if the context holds session cookies, loading the saved ones if needed.
+        
+        A persistent profile context that is already signed in counts as authenticated without the
+        cookie file, so a profile logged in once does not log in again (or get older cookies loaded over it).
+        """
+        if not self._cookies_loaded.get(context):
+            if context is self.shared_context and await _has_session_cookies(context):
+                self._cookies_loaded[context] = True
+            else:
+                self._cookies_loaded[context] = await _load_cookies(context)
+        return self._cookies_loaded[context]
+    
+    async def new_page(self, context, block_resources=True):
+        """Opens a page in a pooled context, aborting heavy resources unless blocking is off for the pool or the call."""
+        page = await context.new_page()
+        if block_resources and self.block_resources:
+            await page.route("**/*", _block_heavy_resources)
+        return page
+    
+    async def article_page(self, context):
+        """Returns one of the context's idle article pages, or opens a new one with resource blocking."""
+        idle = self._idle_pages.get(context)
+        while idle:
+            page = idle.pop()
+            if not page.is_closed():
+                return page
+        page = await self.new_page(context)
+        page.set_default_navigation_timeout(NAVIGATION_TIMEOUT_MS)
+        # A crashed page cannot navigate again; closing it keeps it out of the idle list
+        page.on("crash", lambda crashed: asyncio.ensure_future(crashed.close()))
+        return page
+    
+    async def release_page(self, context, page):
+        """Keeps an article page open for the context's next scrape once its debug screenshots are written."""
+        await _wait_for_screenshots()
+        if not page.is_closed():
+            self._idle_pages.setdefault(context, []).append(page)
+    
+    def mark_authenticated(self, context):
+        """Records that the context now holds a logged-in session (e.g. after _login_medium)."""
+        self._cookies_loaded[context] = True
+
+async def _has_session_cookies(context):
+    """Returns True if the context has a signed-in medium.com session (a uid cookie not prefixed with the logged-out "lo_")."""
+    try:
+        cookies = await context.cookies("https://medium.com")
+    except Exception:
+        return False
+    return any(cookie["name"] == "uid" and cookie["value"] and not cookie["value"].startswith("lo_") for cookie in cookies)
+
+async def _block_heavy_resources(route):
+    """Route handler that aborts BLOCKED_RESOURCE_TYPES (image, media, font, stylesheet) and tracker requests and lets everything else through."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(part in request.url for part in BLOCKED_URL_PARTS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _get_profile_context():
+    """
+    Returns the persistent BrowserContext backed by MEDIUM_PROFILE_DIR, launching it on first use.
+    
+    Chromium stores the profile's cookies and storage itself, so a session established once (by
+    loading the cookie file or logging in) survives server restarts.
+    """
+    global _PW, _PROFILE_CONTEXT
+    async with _BROWSER_LOCK:
+        if _PROFILE_CONTEXT is not None:
+            return _PROFILE_CONTEXT
+        if _PW is None:
+            _PW = await async_playwright().start()
+        context = await _PW.chromium.launch_persistent_context(
+            MEDIUM_PROFILE_DIR,
+            headless=not DEBUG_MODE,
+            user_agent=SCRAPER_USER_AGENT
+        )
+        context.on("close", _forget_profile_context)
+        _PROFILE_CONTEXT = context
+        return context
+
+def _forget_profile_context(context):
+    """Drops the cached profile context once it closes, so the next call relaunches it."""
+    global _PROFILE_CONTEXT
+    if _PROFILE_CONTEXT is context:
+        _PROFILE_CONTEXT = None
+
+async def _get_context_pool():
+    """Returns the context pool bound to the current shared browser, recreating it after a relaunch."""
+    global _CONTEXT_POOL
+    if MEDIUM_PROFILE_DIR:
+        context = await _get_profile_context()
+        if _CONTEXT_POOL is None or _CONTEXT_POOL.shared_context is not context:
+            _CONTEXT_POOL = _ContextPool(None, POOL_SIZE, MAX_USES_PER_CONTEXT, shared_context=context, block_resources=BLOCK_RESOURCES)
+        return _CONTEXT_POOL
+    
+    browser = await _get_browser()
+    if _CONTEXT_POOL is None or _CONTEXT_POOL.browser is not browser:
+        _CONTEXT_POOL = _ContextPool(browser, POOL_SIZE, MAX_USES_PER_CONTEXT, block_resources=BLOCK_RESOURCES)
+    return _CONTEXT_POOL
+
+async def _close_browser():
+    """Closes the shared browser, the profile context and the Playwright driver, if they were started."""
+    global _PW, _BROWSER, _CONTEXT_POOL, _PROFILE_CONTEXT
+    async with _BROWSER_LOCK:
+        try:
+            if _PROFILE_CONTEXT is not None:
+                await _PROFILE_CONTEXT.close()
+            if _BROWSER is not None:
+                await _BROWSER.close()
+            if _PW is not None:
+                await _PW.stop()
+        except Exception as e:
+            print(f"Failed to close browser: {e}", file=sys.stderr)
+        finally:
+            _BROWSER = None
+            _PW = None
+            _CONTEXT_POOL = None
+            _PROFILE_CONTEXT = None
+
+async def _first_visible(page, selectors, cached=None):
+    """
+    Returns the first selector, in list order, whose first match is visible, or None.
+    
+    Plain CSS candidates are all checked in a single page.evaluate round-trip. Selectors that only
+    Playwright understands (e.g. :has-text()) make document.querySelector throw, so those are
+    checked with a locator instead, still in their place in the priority order.
+    
+    Args:
+        page: The Playwright page to query.
+        selectors (list): Candidate selectors in priority order.
+        cached (str, optional): The selector that matched on a previous run; tried first if it is
+                                still one of the candidates.
+    """
+    if cached in selectors:
+        selectors = [cached] + [selector for selector in selectors if selector != cached]
+    results = await page.evaluate(FIRST_VISIBLE_SCRIPT, selectors)
+    for selector, visible in zip(selectors, results):
+        if visible is None:
+            try:
+                locator = page.locator(selector).first
+                visible = await locator.count() > 0 and await locator.is_visible()
+            except Exception:
+                visible = False
+        if visible:
+            return selector
+    return None
+
+def _is_medium_post(response):
+    """expect_response predicate for a form submission to Medium itself; login pages load unblocked, so third-party beacons POST too."""
+    if response.request.method != "POST":
+        return False
+    host = urlparse(response.url).hostname or ""
+    return host == "medium.com" or host.endswith(".medium.com")
+
+async def _visible_within(locator, timeout):
+    """Waits up to timeout ms for a locator to become visible; returns False instead of raising on timeout."""
+    try:
+        await locator.wait_for(state="visible", timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+async def _probe_me_redirect(cookies):
+    """
+    Requests medium.com/me with the saved cookies over plain HTTP, without following redirects.
+    
+    Returns:
+        tuple: (valid, location) where valid is True for a redirect to the member's profile (/@username),
+               False for a redirect to sign-in, and None when the answer is unclear (blocked request,
+               unexpected status), in which case the caller falls back to the browser check
+    """
+    try:
+        response = await _http_client(cookies, follow_redirects=False, timeout=5).get("https://medium.com/me")
+    except httpx.HTTPError:
+        return None, None
+    location = response.headers.get("location")
+    if not response.is_redirect or not location:
+        return None, location
+    if urlparse(location).path.startswith("/@"):
+        return True, location
+    if "signin" in location or "sign-in" in location:
+        return False, location
+    return None, location
+
+def _http_client(cookies, follow_redirects, timeout):
+    """
+    Returns an httpx client carrying the given cookies on top of the shared connection pool.
+    
+    The client only holds its own cookie jar and settings, so it is not closed after use; closing it
+    would close the shared transport. The transport is closed by _close_http_transport on shutdown.
+    """
+    global _HTTP_TRANSPORT
+    if _HTTP_TRANSPORT is None:
+        _HTTP_TRANSPORT = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE)
+    return httpx.AsyncClient(
+        transport=_HTTP_TRANSPORT,
+        cookies=_cookie_jar(cookies),
+        headers={"User-Agent": SCRAPER_USER_AGENT},
+        follow_redirects=follow_redirects,
+        timeout=timeout
+    )
+
+async def _close_http_transport():
+    """Closes the shared HTTP connection pool, if it was opened."""
+    global _HTTP_TRANSPORT
+    if _HTTP_TRANSPORT is not None:
+        transport, _HTTP_TRANSPORT = _HTTP_TRANSPORT, None
+        try:
+            await transport.aclose()
+        except Exception as e:
+            print(f"Failed to close HTTP connections: {e}", file=sys.stderr)
+
+def _cookie_jar(cookies):
+    """Builds an httpx cookie jar from Playwright-style cookie dicts."""
+    jar = httpx.Cookies()
+    for cookie in cookies:
+        jar.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ".medium.com"), path=cookie.get("path", "/"))
+    return jar
+
+async def _fetch_article_http(context, short_url):
+    """
+    Fetches and parses an article over plain HTTP using the cookies held by a browser context.
+    
+    Medium renders article pages on the server, so this skips browser navigation and JavaScript
+    entirely on the common path.
+    
+    Args:
+        context: The Playwright browser context whose session cookies are sent with the request.
+        short_url (str): The canonical URL of the article.
+    
+    Returns:
+        dict: The same article dictionary as _scrape_medium_article, or None if the response looks
+              like an error, challenge, login or paywall page and the browser should be used instead.
+    """
+    try:
+        cookies = await context.cookies(short_url)
+        client = _http_client(cookies, follow_redirects=True, timeout=NAVIGATION_TIMEOUT_MS / 1000)
+        response = await client.get(short_url)
+    except Exception:
+        return None
+    
+    html = response.text
+    if response.status_code != 200 or len(html) < HTTP_ARTICLE_MIN_BYTES or _PAYWALL_RE.search(html):
+        return None
+    
+    article_data = _parse_article_page(html, short_url)
+    if not article_data["Scraped text"]:
+        return None
+    return article_data
+
+def _parse_article_page(html, short_url):
+    """
+    Extracts the title, text and images from a full article page's HTML.
+    
+    Mirrors _scrape_medium_article for HTML fetched without a browser: the <title> gives the name and
+    the first non-empty ARTICLE_SELECTORS match (or <body>) gives the content.
+    """
+    title_match = re.search(r"<title[^>]*>(.*?)</title>", html, re.IGNORECASE | re.DOTALL)
+    article_name = unescape(title_match.group(1)).strip() if title_match else ""
+    if " | Medium" in article_name:
+        article_name = article_name.split(" | Medium")[0]
+    
+    processed_text, article_image_urls, selector = _process_article_page(html)
+    
+    article_debug = {
+        "title": article_name,
+        "url": short_url,
+        "source": "http",
+        "content_length": len(html),
+        "selector_used": selector,
+        "article_image_count": len(article_image_urls),
+        "processed_text_length": len(processed_text)
+    } if DEBUG_MODE else None
+    
+    return {
+        "Name": article_name,
+        "Link": short_url,
+        "Scraped text": processed_text,
+        "Images": article_image_urls,
+        "article_debug": article_debug
+    }
+
+def _process_article_page(html):
+    """
+    Processes a full article page like _process_article_html, parsing the page only once.
+    
+    The first non-empty ARTICLE_SELECTORS match (or <body> when none matches) is converted where it
+    sits in the parsed page, instead of being serialized back to HTML and parsed a second time.
+    
+    Returns:
+        tuple: (text, image_urls, selector) where selector is None for the <body> fallback
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        root, selector = tree.body, None
+        for candidate in ARTICLE_SELECTORS:
+            node = tree.css_first(candidate)
+            if node is not None and node.inner_html.strip():
+                root, selector = node, candidate
+                break
+        text, image_urls = _lexbor_article_text(root) if root is not None else ("", [])
+    else:
+        soup = BeautifulSoup(html, BS4_PARSER)
+        root, selector = soup.body, None
+        for candidate in ARTICLE_SELECTORS:
+            node = soup.select_one(candidate)
+            if node is not None and node.decode_contents().strip():
+                root, selector = node, candidate
+                break
+        text, image_urls = _bs4_article_text(root) if root is not None else ("", [])
+    return text, list(dict.fromkeys(image_urls)), selector
+
+def _take_screenshot(page, name, failure=False, stamp=None):
+    """
+    Starts a clipped screenshot in the background only when DEBUG_MODE is True.
+    
+    The tool carries on while Chromium encodes and writes the image; _close_page() and
+    _ContextPool.release_page() wait for pending screenshots before the page is closed or reused,
+    so the returned path is always written.
+    
+    Args:
+        page: The Playwright page to capture.
+        name (str): Prefix for the screenshot file name.
+        failure (bool): Marks an error-branch screenshot, which is saved as a smaller quality-60 JPEG
+                        of the first 800 pixels instead of a PNG.
+        stamp (str, optional): Suffix for the file name; defaults to the current time.
+    
+    Returns:
+        str: The path the screenshot is being written to, or None when skipped
+    """
     if DEBUG_MODE:
         try:
-            now = datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_path = f"{SCREENSHOTS_DIR}/{name}_{now}.png"
-            await page.screenshot(path=screenshot_path)
+            now = stamp or datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            if failure:
+                screenshot_path = f"{SCREENSHOTS_DIR}/{name}_{now}.jpg"
+                options = {"type": "jpeg", "quality": 60, "clip": FAILURE_SCREENSHOT_CLIP}
+            else:
+                screenshot_path = f"{SCREENSHOTS_DIR}/{name}_{now}.png"
+                options = {"clip": SCREENSHOT_CLIP}
+            task = asyncio.create_task(_write_screenshot(page, screenshot_path, options))
+            _PENDING_SCREENSHOTS.add(task)
+            task.add_done_callback(_PENDING_SCREENSHOTS.discard)
             return screenshot_path
         except Exception as e:
-            print(f"Failed to take screenshot: {e}")
+            print(f"Failed to take screenshot: {e}", file=sys.stderr)
             return None
     return None
 
+async def _write_screenshot(page, screenshot_path, options):
+    """Background half of _take_screenshot(); failures are printed rather than raised."""
+    try:
+        await page.screenshot(path=screenshot_path, full_page=False, **options)
+    except Exception as e:
+        print(f"Failed to take screenshot: {e}", file=sys.stderr)
+
+async def _wait_for_screenshots():
+    """Waits for any debug screenshots still being written in the background."""
+    if _PENDING_SCREENSHOTS:
+        await asyncio.gather(*_PENDING_SCREENSHOTS)
+
+async def _close_page(page):
+    """Closes a page once any debug screenshots still being written have finished."""
+    await _wait_for_screenshots()
+    await page.close()
+
 async def _login_medium(page):
     """
     Logs into Medium using provided credentials via a simulated user login flow.
@@ -659,11 +1388,41 @@ async def _login_medium(page):
         "page_title": None
     }
     
-    def add_step(name, details=None):
-        step = {"name": name, "time": datetime.datetime.now().isoformat()}
-        if details:
-            step.update(details)
-        debug["steps"].append(step)
+    if DEBUG_MODE:
+        def add_step(name, details=None):
+            step = {"name": name, "time_ns": time.monotonic_ns()}
+            if details:
+                step.update(details)
+            debug["steps"].append(step)
+    else:
+        add_step = _skip_debug_step
+    
+    if DEBUG_MODE:
+        # Screenshots from one login share a timestamp and are numbered in the order they were taken
+        run_ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        snap_count = 0
+        
+        def snap(name, failure=False, step=None):
+            nonlocal snap_count
+            snap_count += 1
+            screenshot_path = _take_screenshot(page, name, failure=failure, stamp=f"{run_ts}_{snap_count}")
+            if screenshot_path:
+                add_step(step or f"{name}_screenshot", {"path": screenshot_path})
+    else:
+        snap = _skip_screenshot
+    
+    # Selectors that matched on the last successful login are probed first; ones that no longer match
+    # are collected in stale_selectors and dropped from the cache
+    selector_cache = _load_selector_cache()
+    stale_selectors = set()
+    
+    async def first_visible(key, selectors):
+        """_first_visible with the cached selector for `key` tried first, noting it as stale if it misses."""
+        cached = selector_cache.get(key)
+        found = await _first_visible(page, selectors, cached)
+        if cached is not None and found != cached:
+            stale_selectors.add(key)
+        return found
         
     try:
         # Save debug info about environment
@@ -675,18 +1434,16 @@ async def _login_medium(page):
         
         # Navigate to the Medium homepage first
         add_step("navigating_to_medium_homepage")
-        # Use networkidle to ensure all resources are loaded
-        await page.goto("https://medium.com", wait_until="networkidle")
+        # Wait for the sign-in link to render instead of waiting for network idle
+        await page.goto("https://medium.com", wait_until="domcontentloaded")
+        try:
+            await page.wait_for_selector(HOMEPAGE_READY_SELECTOR, state="attached", timeout=NAVIGATION_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            add_step("homepage_ready_timeout")
         debug["current_url"] = page.url
-        debug["page_title"] = await page.title()
         
         # Take a screenshot of the homepage
-        screenshot_path = await _take_screenshot(page, "medium_homepage")
-        if screenshot_path:
-            add_step("medium_homepage_screenshot", {"path": screenshot_path})
-        
-        # Wait for page to be fully loaded
-        await page.wait_for_load_state("networkidle")
+        snap("medium_homepage")
         
         # Check for sign-in button (try multiple selectors)
         signin_selectors = [
@@ -696,50 +1453,28 @@ async def _login_medium(page):
             'button:has-text("Sign in")'
         ]
         
-        signin_button = None
-        found_selector = None
-        
-        for selector in signin_selectors:
-            try:
-                # Use proper count check instead of the object check
-                if await page.locator(selector).count() > 0 and await page.locator(selector).first.is_visible():
-                    signin_button = page.locator(selector).first
-                    found_selector = selector
-                    debug["selectors_found"]["signin_button"] = selector
-                    break
-            except Exception as e:
-                add_step("selector_check_failed", {"selector": selector, "error": str(e)})
+        # One query for the whole candidate list: the first visible element matching any of them;
+        # the title is only read for debugging, once the probe has resolved
+        found_selector = ", ".join(signin_selectors)
+        signin_button = page.locator(found_selector).filter(visible=True).first
+        signin_count = await signin_button.count()
+        if DEBUG_MODE:
+            debug["page_title"] = await page.title()
+        # The union locator is not a cached step, so it is only logged with the click below
+        if signin_count == 0:
+            signin_button = None
         
         if not signin_button:
             # Take a screenshot of the page when sign-in button not found
-            screenshot_path = await _take_screenshot(page, "signin_button_not_found")
-            if screenshot_path:
-                add_step("signin_button_not_found_screenshot", {"path": screenshot_path})
+            snap("signin_button_not_found", failure=True)
             
-            # Try to capture all available button text for debugging
-            buttons_text = []
-            for button in await page.locator('button').all():
+            # Try to capture all available button and link text for debugging
+            if DEBUG_MODE:
                 try:
-                    text = await button.inner_text()
-                    if text.strip():
-                        buttons_text.append(text.strip())
-                except:
-                    pass
-                    
-            links_text = []
-            for link in await page.locator('a').all():
-                try:
-                    text = await link.inner_text()
-                    if text.strip():
-                        links_text.append(text.strip())
+                    add_step("available_ui_elements", await page.evaluate(UI_ELEMENTS_SCRIPT, {"buttons": "button", "links": "a"}))
                 except:
                     pass
             
-            add_step("available_ui_elements", {
-                "buttons": buttons_text[:10],  # Limit to first 10 to avoid huge output
-                "links": links_text[:10]
-            })
-            
             return {
                 "authenticated": False, 
                 "error": "Sign In button not found on Medium homepage",
@@ -749,16 +1484,10 @@ async def _login_medium(page):
         add_step("clicking_signin_button", {"selector_used": found_selector})
         await signin_button.click()
         
-        # Use explicit wait rather than fixed sleep
-        await page.wait_for_load_state("networkidle")
-        
         # Take a screenshot after clicking sign-in
-        screenshot_path = await _take_screenshot(page, "after_signin_click")
-        if screenshot_path:
-            add_step("after_signin_click_screenshot", {"path": screenshot_path})
+        snap("after_signin_click")
         
         debug["current_url"] = page.url
-        debug["page_title"] = await page.title()
         
         # Check for "Sign in with email" option
         email_option_selectors = [
@@ -768,39 +1497,26 @@ async def _login_medium(page):
             'a:has-text("sign in with email")'
         ]
         
-        email_option = None
-        found_selector = None
-        
-        for selector in email_option_selectors:
-            try:
-                # Use proper count check instead of the object check
-                if await page.locator(selector).count() > 0 and await page.locator(selector).first.is_visible():
-                    email_option = page.locator(selector).first
-                    found_selector = selector
-                    debug["selectors_found"]["email_option"] = selector
-                    break
-            except Exception as e:
-                add_step("selector_check_failed", {"selector": selector, "error": str(e)})
+        # The sign-in dialog renders after the click, so wait for the option itself rather than for the network
+        found_selector = ", ".join(email_option_selectors)
+        email_option = page.locator(found_selector).filter(visible=True).first
+        email_option_visible = await _visible_within(email_option, NAVIGATION_TIMEOUT_MS)
+        if DEBUG_MODE:
+            debug["page_title"] = await page.title()
+        if not email_option_visible:
+            email_option = None
         
         if not email_option:
             # Take a screenshot when email option not found
-            now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_path = f"{SCREENSHOTS_DIR}/email_option_not_found_{now}.png"
-            await page.screenshot(path=screenshot_path)
-            add_step("email_option_not_found_screenshot", {"path": screenshot_path})
+            snap("email_option_not_found", failure=True)
             
             # Try to capture all available button text for debugging
-            buttons_text = []
-            for button in await page.locator('button').all():
+            if DEBUG_MODE:
                 try:
-                    text = await button.inner_text()
-                    if text.strip():
-                        buttons_text.append(text.strip())
+                    add_step("available_buttons", await page.evaluate(UI_ELEMENTS_SCRIPT, {"buttons": "button"}))
                 except:
                     pass
             
-            add_step("available_buttons", {"buttons": buttons_text[:10]})
-            
             return {
                 "authenticated": False, 
                 "error": "Email sign-in option not found",
@@ -810,16 +1526,10 @@ async def _login_medium(page):
         add_step("clicking_email_option", {"selector_used": found_selector})
         await email_option.click()
         
-        # Use explicit wait rather than fixed sleep
-        await page.wait_for_load_state("networkidle")
-        
         # Take a screenshot after clicking email option
-        screenshot_path = await _take_screenshot(page, "after_email_option_click")
-        if screenshot_path:
-            add_step("after_email_option_click_screenshot", {"path": screenshot_path})
+        snap("after_email_option_click")
         
-        # Wait for the email input field to appear
-        # Use a more explicit wait for the email field
+        # Wait for the email input field to appear; this is the only wait after the click
         try:
             await page.wait_for_selector('input[type="email"]', state="visible", timeout=5000)
         except:
@@ -835,24 +1545,14 @@ async def _login_medium(page):
         ]
         
         email_field = None
-        found_selector = None
-        
-        for selector in email_field_selectors:
-            try:
-                # Use proper count check instead of the object check
-                if await page.locator(selector).count() > 0 and await page.locator(selector).first.is_visible():
-                    email_field = page.locator(selector).first
-                    found_selector = selector
-                    debug["selectors_found"]["email_field"] = selector
-                    break
-            except Exception as e:
-                add_step("selector_check_failed", {"selector": selector, "error": str(e)})
+        found_selector = await first_visible("email_field", email_field_selectors)
+        if found_selector:
+            email_field = page.locator(found_selector).first
+            debug["selectors_found"]["email_field"] = found_selector
         
         if not email_field:
             # Take a screenshot when email field not found
-            screenshot_path = await _take_screenshot(page, "email_field_not_found")
-            if screenshot_path:
-                add_step("email_field_not_found_screenshot", {"path": screenshot_path})
+            snap("email_field_not_found", failure=True)
             
             return {
                 "authenticated": False, 
@@ -863,9 +1563,6 @@ async def _login_medium(page):
         add_step("filling_email_field", {"selector_used": found_selector, "email_length": len(MEDIUM_EMAIL)})
         await email_field.fill(MEDIUM_EMAIL)
         
-        # Give a short pause after filling
-        await asyncio.sleep(1)
-        
         # Find continue button
         continue_button_selectors = [
             'button:has-text("Continue")',
@@ -874,24 +1571,14 @@ async def _login_medium(page):
         ]
         
         continue_button = None
-        found_selector = None
-        
-        for selector in continue_button_selectors:
-            try:
-                # Use proper count check instead of the object check
-                if await page.locator(selector).count() > 0 and await page.locator(selector).first.is_visible():
-                    continue_button = page.locator(selector).first
-                    found_selector = selector
-                    debug["selectors_found"]["continue_button"] = selector
-                    break
-            except Exception as e:
-                add_step("selector_check_failed", {"selector": selector, "error": str(e)})
+        found_selector = await first_visible("continue_button", continue_button_selectors)
+        if found_selector:
+            continue_button = page.locator(found_selector).first
+            debug["selectors_found"]["continue_button"] = found_selector
         
         if not continue_button:
             # Take a screenshot when continue button not found
-            screenshot_path = await _take_screenshot(page, "continue_button_not_found")
-            if screenshot_path:
-                add_step("continue_button_not_found_screenshot", {"path": screenshot_path})
+            snap("continue_button_not_found", failure=True)
             
             return {
                 "authenticated": False, 
@@ -900,21 +1587,22 @@ async def _login_medium(page):
             }
         
         add_step("clicking_continue_button", {"selector_used": found_selector})
-        await continue_button.click()
-        
-        # Wait for the network to be idle
-        await page.wait_for_load_state("networkidle")
+        # Wait for the form submission itself, then for the step it leads to (password field, or
+        # the user menu when Medium signs the account straight in)
+        try:
+            async with page.expect_response(_is_medium_post, timeout=10000):
+                await continue_button.click()
+        except PlaywrightTimeoutError:
+            add_step("continue_response_timeout")
+        try:
+            await page.wait_for_selector('input[type="password"], [aria-label="User"]', timeout=NAVIGATION_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            add_step("password_step_timeout")
         
         # Take a screenshot after clicking continue
-        screenshot_path = await _take_screenshot(page, "after_continue_click")
-        if screenshot_path:
-            add_step("after_continue_click_screenshot", {"path": screenshot_path})
+        snap("after_continue_click")
         
         debug["current_url"] = page.url
-        debug["page_title"] = await page.title()
-        
-        # Wait for page to stabilize
-        await asyncio.sleep(2)
         
         # Check for password field
         password_field_selectors = [
@@ -924,26 +1612,21 @@ async def _login_medium(page):
         ]
         
         password_field = None
-        found_selector = None
-        
-        for selector in password_field_selectors:
-            try:
-                # Use proper count check instead of the object check
-                if await page.locator(selector).count() > 0 and await page.locator(selector).first.is_visible():
-                    password_field = page.locator(selector).first
-                    found_selector = selector
-                    debug["selectors_found"]["password_field"] = selector
-                    break
-            except Exception as e:
-                add_step("selector_check_failed", {"selector": selector, "error": str(e)})
+        found_selector = await first_visible("password_field", password_field_selectors)
+        if DEBUG_MODE:
+            debug["page_title"] = await page.title()
+        if found_selector:
+            password_field = page.locator(found_selector).first
+            debug["selectors_found"]["password_field"] = found_selector
         
+        # Outcome of the post-sign-in wait for a logged-in element; None when there was no password step
+        auth_wait_result = None
         if password_field:
             add_step("filling_password_field", {
                 "selector_used": found_selector,
                 "password_length": len(MEDIUM_PASSWORD) if MEDIUM_PASSWORD else 0
             })
             await password_field.fill(MEDIUM_PASSWORD)
-            await asyncio.sleep(1)
             
             # Find sign in button
             signin_button_selectors = [
@@ -953,25 +1636,14 @@ async def _login_medium(page):
             ]
             
             signin_button = None
-            found_selector = None
-            
-            for selector in signin_button_selectors:
-                try:
-                    # Use proper count check instead of the object check
-                    if await page.locator(selector).count() > 0 and await page.locator(selector).first.is_visible():
-                        signin_button = page.locator(selector).first
-                        found_selector = selector
-                        debug["selectors_found"]["password_signin_button"] = selector
-                        break
-                except Exception as e:
-                    add_step("selector_check_failed", {"selector": selector, "error": str(e)})
+            found_selector = await first_visible("password_signin_button", signin_button_selectors)
+            if found_selector:
+                signin_button = page.locator(found_selector).first
+                debug["selectors_found"]["password_signin_button"] = found_selector
             
             if not signin_button:
                 # Take a screenshot when sign in button not found
-                now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"{SCREENSHOTS_DIR}/signin_button_not_found_{now}.png"
-                await page.screenshot(path=screenshot_path)
-                add_step("signin_button_not_found_screenshot", {"path": screenshot_path})
+                snap("signin_button_not_found", failure=True)
                 
                 return {
                     "authenticated": False, 
@@ -980,68 +1652,57 @@ async def _login_medium(page):
                 }
             
             add_step("clicking_signin_button", {"selector_used": found_selector})
-            await signin_button.click()
+            # Wait for the credentials POST instead of for the network to go quiet
+            try:
+                async with page.expect_response(_is_medium_post, timeout=10000):
+                    await signin_button.click()
+            except PlaywrightTimeoutError:
+                add_step("signin_response_timeout")
             
-            # Wait for the network to be idle
-            await page.wait_for_load_state("networkidle")
-            await asyncio.sleep(3)
+            # Return as soon as any logged-in element shows up instead of waiting a fixed time
+            try:
+                await page.locator(", ".join(AUTH_CHECK_SELECTORS)).filter(visible=True).first.wait_for(state="visible", timeout=15000)
+                auth_wait_result = True
+            except PlaywrightTimeoutError:
+                add_step("auth_wait_timeout")
+                auth_wait_result = False
             
             # Take a screenshot after clicking sign in
-            screenshot_path = await _take_screenshot(page, "after_signin_password")
-            if screenshot_path:
-                add_step("after_signin_password_screenshot", {"path": screenshot_path})
+            snap("after_signin_password")
         else:
             add_step("no_password_field_found", {"likely_using_email_link": True})
         
-        # Verify login success by checking for user-specific elements
-        auth_check_selectors = [
-            'button[aria-label="User"]',   # Current avatar button
-            'img.avatar',                  # Avatar image
-            'a[href*="/@"]',               # Profile link
-            'a[href="/me"]',               # "Me" link
-            'button:has-text("Write")',    # Write button (logged-in users)
-            'div[data-testid="user-menu"]' # User menu
-        ]
-        
-        is_authenticated = False
+        # Verify login success by checking for user-specific elements. After a password sign-in the wait
+        # above already gave the answer, so the selectors are only probed again to name the match in DEBUG_MODE
         authenticated_selector = None
-        
-        for selector in auth_check_selectors:
-            try:
-                # Use proper count check instead of the object check
-                if await page.locator(selector).count() > 0 and await page.locator(selector).first.is_visible():
-                    is_authenticated = True
-                    authenticated_selector = selector
-                    debug["selectors_found"]["auth_confirmation"] = selector
-                    break
-            except Exception as e:
-                add_step("auth_check_failed", {"selector": selector, "error": str(e)})
+        if auth_wait_result is None or (auth_wait_result and DEBUG_MODE):
+            authenticated_selector = await first_visible("auth_confirmation", AUTH_CHECK_SELECTORS)
+        is_authenticated = auth_wait_result if auth_wait_result is not None else authenticated_selector is not None
+        if is_authenticated:
+            debug["selectors_found"]["auth_confirmation"] = authenticated_selector
         
         if is_authenticated:
             add_step("authentication_successful", {"selector_found": authenticated_selector})
+            _save_selector_cache(debug["selectors_found"], stale_selectors)
             
             # Take a screenshot of success state
-            screenshot_path = await _take_screenshot(page, "login_success")
-            if screenshot_path:
-                add_step("login_success_screenshot", {"path": screenshot_path})
+            snap("login_success")
             
             return {"authenticated": True, "error": None, "debug": debug}
         else:
             add_step("authentication_failed")
             
             # Take a screenshot of failed state
-            screenshot_path = await _take_screenshot(page, "login_failed")
-            if screenshot_path:
-                add_step("login_failed_screenshot", {"path": screenshot_path})
+            snap("login_failed", failure=True)
             
             # Additional check: See if there's an error message
             error_message = ""
             try:
-                for error_selector in ['.error-message', '.form-error', '.errorMessage']:
-                    if await page.locator(error_selector).count() > 0:
-                        error_message = await page.locator(error_selector).first.inner_text()
-                        add_step("error_message_found", {"message": error_message})
-                        break
+                # all_inner_texts() answers "is there one" and "what does it say" in a single round-trip
+                error_texts = await page.locator(".error-message, .form-error, .errorMessage").first.all_inner_texts()
+                if error_texts:
+                    error_message = error_texts[0]
+                    add_step("error_message_found", {"message": error_message})
             except:
                 pass
             
@@ -1053,9 +1714,8 @@ async def _login_medium(page):
                     "debug": debug
                 }
             
-            # Check for CAPTCHA - this would require human intervention
-            page_content = await page.content()
-            if "captcha" in page_content.lower():
+            # Check for CAPTCHA - this would require human intervention; a DOM query avoids transferring the page
+            if await page.locator(CAPTCHA_SELECTOR).count() > 0:
                 return {
                     "authenticated": False, 
                     "error": "CAPTCHA detected. Manual login required.",
@@ -1073,23 +1733,17 @@ async def _login_medium(page):
         add_step("exception", {"error": error_msg})
         
         # Take a screenshot of the exception state
-        try:
-            now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_path = f"{SCREENSHOTS_DIR}/login_exception_{now}.png"
-            await page.screenshot(path=screenshot_path)
-            add_step("exception_screenshot", {"path": screenshot_path})
-        except:
-            pass
+        snap("login_exception", failure=True, step="exception_screenshot")
         
         return {"authenticated": False, "error": error_msg, "debug": debug}
 
 async def _save_cookies(context):
     """
-    Saves the current browser context cookies to a file for persistent session management.
+    Saves the current browser context's storage state to a file for persistent session management.
     
-    This function retrieves all cookies from the given Playwright browser context and writes them
-    to a JSON file. These cookies can later be reloaded to maintain a logged-in session without
-    needing to perform the login flow again.
+    This function retrieves the cookies and localStorage of the given Playwright browser context
+    (context.storage_state()) and writes them to a JSON file. This state can later be reloaded to
+    maintain a logged-in session without needing to perform the login flow again.
     
     Args:
         context: The Playwright browser context containing session cookies.
@@ -1098,10 +1752,10 @@ async def _save_cookies(context):
         bool: True if cookies were successfully saved, False otherwise
     """
     try:
-        cookies = await context.cookies()
+        state = await context.storage_state()
         
         # Check if we actually have cookies to save
-        if not cookies or len(cookies) == 0:
+        if not state.get("cookies"):
             return False
             
         # Try to save cookies
@@ -1109,17 +1763,128 @@ async def _save_cookies(context):
         if cookie_dir and not os.path.exists(cookie_dir):
             os.makedirs(cookie_dir, exist_ok=True)
             
-        with open(MEDIUM_COOKIES_FILE, "w") as f:
-            json.dump(cookies, f)
-            
-        # Verify file was created
-        if not os.path.exists(MEDIUM_COOKIES_FILE):
-            return False
+        # Write to a temporary file first so a crash mid-write cannot leave a truncated cookie file
+        tmp_path = f"{MEDIUM_COOKIES_FILE}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_json_dumps(state))
+        os.replace(tmp_path, MEDIUM_COOKIES_FILE)
+        
+        # Prime the parsed-file cache with what was just written, so the next scrape does not read it back;
+        # stat() also confirms the file is in place
+        _COOKIE_CACHE["data"] = state
+        _COOKIE_CACHE["mtime"] = os.stat(MEDIUM_COOKIES_FILE).st_mtime_ns
             
         return True
     except Exception as e:
         return False
 
+def _read_cookie_file():
+    """
+    Returns the parsed contents of MEDIUM_COOKIES_FILE, caching them until the file changes.
+    
+    The cache is keyed on the file's modification time, so the cookie file is only read and
+    parsed again after it has been rewritten (e.g. by _save_cookies or generate_medium_cookies.py).
+    Callers must not mutate the returned value.
+    
+    Raises:
+        OSError: If the file cannot be read.
+        json.JSONDecodeError: If the file does not contain valid JSON.
+    """
+    mtime = os.stat(MEDIUM_COOKIES_FILE).st_mtime_ns
+    if _COOKIE_CACHE["mtime"] != mtime:
+        with open(MEDIUM_COOKIES_FILE, "rb") as f:
+            _COOKIE_CACHE["data"] = _json_loads(f.read())
+        _COOKIE_CACHE["mtime"] = mtime
+    return _COOKIE_CACHE["data"]
+
+def _get_cookies():
+    """
+    Returns the cookie list from MEDIUM_COOKIES_FILE.
+    
+    The file holds either a Playwright storage state ({"cookies": [...], "origins": [...]}, as written
+    by _save_cookies) or a bare cookie list (the older format); both yield the cookie list.
+    
+    Raises:
+        OSError: If the file cannot be read.
+        json.JSONDecodeError: If the file does not contain valid JSON.
+    """
+    data = _read_cookie_file()
+    if isinstance(data, dict):
+        return data.get("cookies")
+    return data
+
+def _get_storage_state():
+    """
+    Returns MEDIUM_COOKIES_FILE as a storage state for browser.new_context(), or None if it is missing or unusable.
+    
+    A bare cookie list is wrapped as a storage state without localStorage origins.
+    """
+    try:
+        if not os.path.exists(MEDIUM_COOKIES_FILE):
+            return None
+        data = _read_cookie_file()
+        if isinstance(data, list):
+            return {"cookies": data, "origins": []}
+        if isinstance(data, dict) and isinstance(data.get("cookies"), list):
+            return {"cookies": data["cookies"], "origins": data.get("origins", [])}
+    except Exception:
+        pass
+    return None
+
+def _load_selector_cache():
+    """Returns the cached login selectors for medium.com, or an empty dict if there are none."""
+    try:
+        with open(MEDIUM_SELECTOR_CACHE_FILE, "rb") as f:
+            return _json_loads(f.read()).get("medium.com", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+# Login steps whose selector is probed through the cache; anything else in the file is dropped on save
+CACHED_LOGIN_STEPS = ("email_field", "continue_button", "password_field", "password_signin_button", "auth_confirmation")
+
+def _save_selector_cache(selectors_found, stale=()):
+    """
+    Records the selectors from a successful login for medium.com, replacing the file atomically.
+    
+    Selectors found this time (None entries skipped) are merged over the cached ones, and cached
+    selectors listed in `stale` because they missed this time are dropped; steps not probed on this
+    login keep their cached selector.
+    """
+    try:
+        try:
+            with open(MEDIUM_SELECTOR_CACHE_FILE, "rb") as f:
+                cache = _json_loads(f.read())
+        except (OSError, ValueError):
+            cache = {}
+        if not isinstance(cache, dict):
+            cache = {}
+        site = cache.get("medium.com")
+        site = {key: value for key, value in site.items() if key not in stale} if isinstance(site, dict) else {}
+        site.update({key: value for key, value in selectors_found.items() if value})
+        site = {key: value for key, value in site.items() if key in CACHED_LOGIN_STEPS}
+        cache["medium.com"] = site
+        cache_dir = os.path.dirname(MEDIUM_SELECTOR_CACHE_FILE)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{MEDIUM_SELECTOR_CACHE_FILE}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_json_dumps(cache))
+        os.replace(tmp_path, MEDIUM_SELECTOR_CACHE_FILE)
+    except Exception as e:
+        print(f"Failed to save selector cache: {e}", file=sys.stderr)
+
+def _json_dumps(obj):
+    """Serialize obj to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def _json_loads(data):
+    """Parse JSON bytes, using orjson when it is installed (its JSONDecodeError subclasses json's)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 async def _load_cookies(context):
     """
     Loads cookies from a file and adds them to the provided browser context to restore a session.
@@ -1135,11 +1900,8 @@ async def _load_cookies(context):
         bool: True if cookies were successfully loaded and added; False otherwise.
     """
     try:
-        if not os.path.exists(MEDIUM_COOKIES_FILE):
-            return False
-            
-        with open(MEDIUM_COOKIES_FILE, "r") as f:
-            cookies = json.load(f)
+        # A missing file raises FileNotFoundError from the cached read, so no separate exists() check
+        cookies = _get_cookies()
             
         # Check if we have valid cookies
         if not cookies or len(cookies) == 0:
@@ -1154,10 +1916,14 @@ def _process_article_html(html):
     """
     Processes the HTML content of an article, replacing image tags with inline placeholders.
     
-    This function parses the article's HTML content using BeautifulSoup and traverses the document.
-    When it encounters an <img> tag, it replaces the tag with a placeholder string in the format:
-    "[IMG: image_url]". The function then returns a plain text representation of the article with
-    these inline placeholders and a list of image URLs found in the article content.
+    This function parses the article's HTML content and traverses the document. When it encounters
+    an <img> tag, it replaces the tag with a placeholder string in the format: "[IMG: image_url]".
+    The function then returns a plain text representation of the article with these inline
+    placeholders and a list of image URLs found in the article content.
+    
+    The HTML is parsed with selectolax's Lexbor engine (a C parser) when it is installed, and with
+    a single streaming pass of the stdlib HTMLParser otherwise, which builds no tree. Both produce
+    the same text.
     
     Args:
         html (str): The HTML content of the article.
@@ -1165,69 +1931,236 @@ def _process_article_html(html):
     Returns:
         tuple: A tuple containing:
             - str: Plain text with image placeholders
-            - list: List of image URLs found in the article content
+            - list: Unique image URLs found in the article content, in order of first appearance
     """
     if not html or len(html.strip()) == 0:
         return "", []
+    
+    if LexborHTMLParser is not None:
+        text, image_urls = _process_article_html_lexbor(html)
+    else:
+        text, image_urls = _process_article_html_stream(html)
+    # Medium repeats an image's URL in responsive variants and galleries; keep each one once
+    return text, list(dict.fromkeys(image_urls))
+
+def _is_article_image(src, width, height, parent_classes):
+    """
+    Decides whether an image is part of the article content rather than a UI element.
+    
+    Args:
+        src (str): The image's src attribute.
+        width: The image's width attribute, if any.
+        height: The image's height attribute, if any.
+        parent_classes (callable): Returns the CSS classes of up to three ancestor elements; only
+                                   called when the URL and size checks are inconclusive.
+    
+    Returns:
+        bool: True if the image looks like article content.
+    """
+    # Filter to include only meaningful article images (exclude tiny UI elements)
+    # Medium article images typically have specific URL patterns or size attributes
+    is_article_image = False
+    
+    # Check image URL patterns common for Medium article content images
+    if _MEDIUM_IMG_RE.search(src):
+        return True
+    
+    # Check image dimensions via attributes (if available)
+    # Medium article images are typically larger than UI elements
+    try:
+        if width and height:
+            # Convert to integers if they're strings
+            if isinstance(width, str) and width.isdigit():
+                width = int(width)
+            if isinstance(height, str) and height.isdigit():
+                height = int(height)
+            
+            # If dimensions suggest it's a substantial image, include it
+            if (isinstance(width, int) and isinstance(height, int) and 
+                    width > 100 and height > 100):
+                return True
+    except:
+        pass
+    
+    # Check parent elements - article images are often in specific containers
+    if _ARTICLE_CLS_RE.search(" ".join(parent_classes())):
+        is_article_image = True
+    
+    return is_article_image
+
+def _lexbor_parent_classes(node):
+    """Returns the CSS classes of up to three ancestors of a Lexbor node."""
+    parent_classes = []
+    parent = node.parent
+    for _ in range(3):  # Check up to 3 levels up
+        if parent is None:
+            break
+        if parent.attributes.get("class"):
+            parent_classes.extend(parent.attributes["class"].split())
+        parent = parent.parent
+    return parent_classes
+
+def _bs4_parent_classes(img):
+    """Returns the CSS classes of up to three ancestors of a BeautifulSoup tag."""
+    parent_classes = []
+    parent = img.parent
+    for _ in range(3):  # Check up to 3 levels up
+        if parent and parent.get('class'):
+            parent_classes.extend(parent.get('class'))
+        if parent:
+            parent = parent.parent
+    return parent_classes
+
+def _process_article_html_lexbor(html):
+    """Implementation of _process_article_html on top of selectolax's Lexbor parser."""
+    tree = LexborHTMLParser(html)
+    return _lexbor_article_text(tree.body or tree.root)
+
+def _lexbor_article_text(root):
+    """Returns the text with image placeholders and the image URLs under a Lexbor node."""
+    image_urls = []
+    
+    # Script and style contents are not article text
+    root.strip_tags(["script", "style"])
+    
+    # Walk the tree once, emitting stripped text nodes and article image placeholders in document
+    # order; the result matches BeautifulSoup's get_text(" ", strip=True) after the placeholder swap
+    text_parts = []
+    for node in root.traverse(include_text=True):
+        tag = node.tag
+        if tag == "-text":
+            text = node.text_content.strip()
+            if text:
+                text_parts.append(text)
+        elif tag == "img":
+            src = node.attributes.get("src")
+            if not src:
+                continue
+            # Emit a placeholder only if it's identified as an article image; other images are dropped
+            if _is_article_image(src, node.attributes.get("width"), node.attributes.get("height"),
+                                 lambda: _lexbor_parent_classes(node)):
+                image_urls.append(src)
+                text_parts.append(f"[IMG: {src}]")
+    
+    return " ".join(text_parts), image_urls
+
+def _process_article_html_stream(html):
+    """Implementation of _process_article_html as one streaming parse, used when selectolax is missing."""
+    extractor = _ArticleTextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return " ".join(extractor.text_parts), extractor.image_urls
+
+class _ArticleTextExtractor(HTMLParser):
+    """
+    Streaming HTML parser that emits article text and image placeholders without building a tree.
+    
+    Text is collected as stripped strings in document order, skipping script, style and template
+    contents, the same strings BeautifulSoup's get_text(" ", strip=True) would yield. Only the classes
+    of the open elements are kept, so _is_article_image can still look at an image's ancestors; elements
+    whose end tag HTML lets authors omit (<p>, <li>, ...) are closed the way browsers close them.
+    """
+    VOID_TAGS = frozenset(["area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+                           "param", "source", "track", "wbr"])
+    SKIPPED_TAGS = frozenset(["script", "style", "template"])
+    # Start tags that close an open <p> (HTML's "close a p element in button scope")
+    P_CLOSING_TAGS = frozenset(["address", "article", "aside", "blockquote", "details", "dialog", "div", "dl",
+                                "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+                                "h5", "h6", "header", "hgroup", "hr", "main", "menu", "nav", "ol", "p", "pre",
+                                "section", "table", "ul"])
+    P_SCOPE_TAGS = frozenset(["applet", "button", "caption", "html", "marquee", "object", "table", "td",
+                              "template", "th"])
+    # Start tag -> (open elements it implicitly closes, ancestors that stop the search)
+    IMPLIED_END_TAGS = {
+        "li": (frozenset(["li"]), frozenset(["ol", "ul", "menu"])),
+        "dt": (frozenset(["dt", "dd"]), frozenset(["dl"])),
+        "dd": (frozenset(["dt", "dd"]), frozenset(["dl"])),
+        "option": (frozenset(["option"]), frozenset(["select", "datalist", "optgroup"])),
+        "optgroup": (frozenset(["option", "optgroup"]), frozenset(["select"])),
+        "tr": (frozenset(["tr", "td", "th"]), frozenset(["table", "tbody", "thead", "tfoot"])),
+        "td": (frozenset(["td", "th"]), frozenset(["tr", "table"])),
+        "th": (frozenset(["td", "th"]), frozenset(["tr", "table"])),
+    }
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text_parts = []
+        self.image_urls = []
+        self._open = []  # (tag, classes) for each open element, innermost last
+        self._skipping = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.P_CLOSING_TAGS:
+            self._close_implied(frozenset(["p"]), self.P_SCOPE_TAGS)
+        if tag in self.IMPLIED_END_TAGS:
+            self._close_implied(*self.IMPLIED_END_TAGS[tag])
         
-    soup = BeautifulSoup(html, "html.parser")
+        if tag == "img":
+            self._handle_img(dict(attrs))
+        elif tag not in self.VOID_TAGS:
+            classes = next((value.split() for name, value in attrs if name == "class" and value), [])
+            self._open.append((tag, classes))
+            if tag in self.SKIPPED_TAGS:
+                self._skipping += 1
+    
+    def handle_startendtag(self, tag, attrs):
+        # HTML ignores the self-closing slash: <div/> opens a <div>, and void elements never open anything
+        self.handle_starttag(tag, attrs)
+    
+    def handle_endtag(self, tag):
+        # Close the innermost matching element, along with any unclosed ones inside it
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index][0] == tag:
+                self._close_from(index)
+                break
+    
+    def _close_implied(self, closable, boundaries):
+        """Closes the innermost open element in `closable` unless one of `boundaries` is open inside it."""
+        for index in range(len(self._open) - 1, -1, -1):
+            open_tag = self._open[index][0]
+            if open_tag in closable:
+                self._close_from(index)
+                return
+            if open_tag in boundaries:
+                return
+    
+    def _close_from(self, index):
+        """Pops the open element at `index` and every element still open inside it."""
+        for closed, _ in self._open[index:]:
+            if closed in self.SKIPPED_TAGS:
+                self._skipping -= 1
+        del self._open[index:]
+    
+    def handle_data(self, data):
+        if not self._skipping:
+            text = data.strip()
+            if text:
+                self.text_parts.append(text)
+    
+    def _handle_img(self, attrs):
+        src = attrs.get("src")
+        if not src or self._skipping:
+            return
+        # Emit a placeholder only if it's identified as an article image; other images are dropped
+        if _is_article_image(src, attrs.get("width"), attrs.get("height"), self._parent_classes):
+            self.image_urls.append(src)
+            self.text_parts.append(f"[IMG: {src}]")
+    
+    def _parent_classes(self):
+        """Returns the CSS classes of up to three open ancestors of the current position."""
+        return [cls for _, classes in reversed(self._open[-3:]) for cls in classes]
+
+def _bs4_article_text(root):
+    """Returns the text with image placeholders and the image URLs under a BeautifulSoup tag."""
     image_urls = []
     
     # Replace each image tag with a placeholder containing its 'src' attribute
     # and collect article image URLs simultaneously
-    for img in soup.find_all("img"):
+    for img in root.find_all("img"):
         src = img.get("src")
         if src:
-            # Filter to include only meaningful article images (exclude tiny UI elements)
-            # Medium article images typically have specific URL patterns or size attributes
-            is_article_image = False
-            
-            # Check image URL patterns common for Medium article content images
-            medium_image_patterns = [
-                "miro.medium.com",
-                "/resize:",
-                "/max/",
-                "/fit:",
-                "/progressive:"
-            ]
-            
-            if any(pattern in src for pattern in medium_image_patterns):
-                is_article_image = True
-            
-            # Check image dimensions via attributes (if available)
-            # Medium article images are typically larger than UI elements
-            try:
-                width = img.get('width')
-                height = img.get('height')
-                if width and height:
-                    # Convert to integers if they're strings
-                    if isinstance(width, str) and width.isdigit():
-                        width = int(width)
-                    if isinstance(height, str) and height.isdigit():
-                        height = int(height)
-                    
-                    # If dimensions suggest it's a substantial image, include it
-                    if (isinstance(width, int) and isinstance(height, int) and 
-                            width > 100 and height > 100):
-                        is_article_image = True
-            except:
-                pass
-                
-            # Check parent elements - article images are often in specific containers
-            parent_classes = []
-            parent = img.parent
-            for _ in range(3):  # Check up to 3 levels up
-                if parent and parent.get('class'):
-                    parent_classes.extend(parent.get('class'))
-                if parent:
-                    parent = parent.parent
-                    
-            article_content_classes = ['graf-image', 'section-image', 'post-image', 'progressiveMedia']
-            if any(cls in parent_classes for cls in article_content_classes):
-                is_article_image = True
-                
             # Replace with placeholder only if it's identified as an article image
-            if is_article_image:
+            if _is_article_image(src, img.get('width'), img.get('height'), lambda: _bs4_parent_classes(img)):
                 placeholder = f"[IMG: {src}]"
                 image_urls.append(src)
                 img.replace_with(placeholder)
@@ -1236,9 +2169,9 @@ def _process_article_html(html):
                 img.replace_with("")
     
     # Use a space as a separator to ensure text elements remain separated
-    return soup.get_text(separator=" ", strip=True), image_urls
+    return root.get_text(separator=" ", strip=True), image_urls
 
-async def _scrape_medium_article(page, short_url):
+async def _scrape_medium_article(page, short_url, snapshot=None):
     """
     Scrapes a Medium article by navigating to its canonical URL and extracting key content.
     
@@ -1252,6 +2185,9 @@ async def _scrape_medium_article(page, short_url):
         page: The Playwright page instance used to navigate and extract content.
         short_url (str): The canonical URL (without tracking parameters) constructed from the URL scheme, 
                          netloc, and path.
+        snapshot (dict, optional): The result of PAGE_SNAPSHOT_SCRIPT if the caller has already run it,
+                                   to reuse its title, document length and article HTML instead of
+                                   asking the browser again.
     
     Returns:
         dict: A dictionary containing:
@@ -1269,77 +2205,57 @@ async def _scrape_medium_article(page, short_url):
                 - processed_text_length: Length of the final processed text
     """
     # Get the article title (strip " | Medium" suffix if present)
-    article_name = await page.title()
+    article_name = snapshot["title"] if snapshot is not None else await page.title()
     if article_name and " | Medium" in article_name:
         article_name = article_name.split(" | Medium")[0]
     
-    # Debug info for article extraction
+    # Debug info for article extraction; built only in DEBUG_MODE, since measuring the page without
+    # a snapshot means transferring the whole document
     article_debug = {
         "title": article_name,
         "url": page.url,
-        "content_length": len(await page.content()),
+        "content_length": snapshot["htmlLength"] if snapshot is not None else len(await page.content()),
         "selectors_tried": []
-    }
+    } if DEBUG_MODE else None
     
-    # Find the article element - try multiple selectors that might match Medium's structure
-    article_selectors = [
-        "article",
-        "div[role='article']",
-        "section.pw-post-body",
-        "section[role='main']",
-        "div.story",
-        "div.meteredContent",
-        "div.postArticle-content",
-        "div.section-inner"
-    ]
-    
-    article_html = ""
-    for selector in article_selectors:
-        try:
-            if await page.locator(selector).count() > 0:
-                article_html = await page.locator(selector).first.inner_html()
-                article_debug["selectors_tried"].append({
-                    "selector": selector,
-                    "found": True,
-                    "content_length": len(article_html)
-                })
-                if article_html and len(article_html.strip()) > 0:
-                    break
-            else:
-                article_debug["selectors_tried"].append({
-                    "selector": selector,
-                    "found": False
-                })
-        except Exception as e:
-            article_debug["selectors_tried"].append({
-                "selector": selector,
-                "error": str(e)
-            })
-
-    # If we still don't have article content, take body as fallback
-    if not article_html:
-        try:
-            article_html = await page.inner_html("body")
-            article_debug["using_body_fallback"] = True
-        except Exception as e:
+    # Find the article element in one browser round-trip: each selector in priority order, then <body>;
+    # the snapshot already carries this result when the caller took one
+    try:
+        if snapshot is not None and "article" in snapshot:
+            found = snapshot["article"]
+        else:
+            found = await page.evaluate(ARTICLE_HTML_SCRIPT, ARTICLE_SELECTORS)
+        article_html = found["html"]
+        if DEBUG_MODE:
+            article_debug["selectors_tried"] = found["tried"]
+            if found["bodyFallback"]:
+                article_debug["using_body_fallback"] = True
+    except Exception as e:
+        article_html = ""
+        if DEBUG_MODE:
             article_debug["body_fallback_error"] = str(e)
     
     # Process the HTML to insert image placeholders and get article image URLs
     processed_text, article_image_urls = _process_article_html(article_html)
     
-    article_debug["article_image_count"] = len(article_image_urls)
-    article_debug["processed_text_length"] = len(processed_text)
+    if DEBUG_MODE:
+        article_debug["article_image_count"] = len(article_image_urls)
+        article_debug["processed_text_length"] = len(processed_text)
     
     return {
         "Name": article_name,
         "Link": short_url,
         "Scraped text": processed_text,
         "Images": article_image_urls,  # Now using only article images from processed content
-        "article_debug": article_debug if DEBUG_MODE else None
+        "article_debug": article_debug
     }
 
 # Ensure the MCP server is exposed properly
 if __name__ == "__main__":
+    # Installed as the loop policy only when run as the server, so importing this module does not
+    # change the event loop of the importing program
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     mcp.run()
 
 # MCP Developer API Reference:
@@ -0,0 +1,40 @@
+import asyncio
+import os
+from playwright.async_api import async_playwright
+
+# Get environment variables
+CDP_PORT = int(os.getenv("CDP_PORT", "9222"))
+
+async def main():
+    """
+    Runs one headless Chromium that several web scraping MCP servers can share.
+    
+    This tool will:
+    1. Launch Chromium with its DevTools (CDP) port open on localhost
+    2. Print the endpoint to set as MEDIUM_CDP_ENDPOINT for each server process
+    3. Keep the browser running until you press Ctrl+C
+    """
+    print("\n=== Shared Browser Server ===")
+    
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=True,
+            args=[f"--remote-debugging-port={CDP_PORT}", "--remote-debugging-address=127.0.0.1"]
+        )
+        
+        print("\nChromium is running. Start each web scraping server with:")
+        print(f"MEDIUM_CDP_ENDPOINT=http://127.0.0.1:{CDP_PORT}")
+        print("\nEvery server creates its own browser contexts, so sessions stay isolated. (Press Ctrl+C to stop)")
+        
+        try:
+            # Keep the browser alive until it is closed or the script is interrupted
+            await asyncio.Event().wait()
+        finally:
+            await browser.close()
+            print("\nBrowser closed.")
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass